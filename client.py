@@ -1,985 +1,1414 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
-import time
-import queue
-import json
-import socket
-import platform
-import sys
-import os
-import subprocess
-from typing import Optional, Callable
-
-# ========== PLATFORM-SPECIFIC IMPORTS ==========
-try:
-    import cv2
-    import numpy as np
-    from PIL import Image, ImageTk
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-    print("OpenCV/PIL not available - video display disabled")
-
-try:
-    from pynput import mouse, keyboard
-    PYNPUT_AVAILABLE = True
-except ImportError:
-    PYNPUT_AVAILABLE = False
-    print("pynput not available - input forwarding disabled")
-
-# ========== CONFIGURATION ==========
-class StreamConfig:
-    def __init__(self):
-        self.width = 1280
-        self.height = 720
-        self.fps = 30
-        self.bitrate = "1M"
-
-class NetworkConfig:
-    def __init__(self):
-        self.video_port = 5555
-        self.control_port = 5556
-        self.discovery_port = 5557
-
-class ConfigManager:
-    def __init__(self):
-        self.stream_config = StreamConfig()
-        self.network_config = NetworkConfig()
-
-# ========== FFMPEG VIDEO RECEIVER ==========
-class FFmpegVideoReceiver:
-    def __init__(self, config_manager):
-        self.config_manager = config_manager
-        self.connected = False
-        self.running = False
-        self.frame_queue = queue.Queue(maxsize=10)
-        self.current_frame = None
-        self.fps = 0
-        self.frame_count = 0
-        self.fps_update_time = time.time()
-        self.on_frame_callback = None
-        self.ffmpeg_process = None
-        self.decoder_thread = None
-        
-        self.platform = platform.system().lower()
-        print(f"Platform: {self.platform}")
-        
-    def connect(self, host_ip: str) -> bool:
-        """Connect to host using FFmpeg for H.264 decoding"""
-        try:
-            self.running = True
-            self.connected = True
-            
-            # Start FFmpeg in a thread
-            self.decoder_thread = threading.Thread(
-                target=self._ffmpeg_receive_loop, 
-                args=(host_ip,),
-                daemon=True
-            )
-            self.decoder_thread.start()
-            
-            print(f"✅ FFmpeg receiver started for {host_ip}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ FFmpeg connection failed: {e}")
-            return False
-    
-    def _ffmpeg_receive_loop(self, host_ip):
-        """FFmpeg reception and decoding loop"""
-        width = self.config_manager.stream_config.width
-        height = self.config_manager.stream_config.height
-        port = self.config_manager.network_config.video_port
-        frame_size = width * height * 3  # BGR24 format
-        
-        # FFmpeg command to receive UDP stream and decode to raw video
-        ffmpeg_cmd = [
-            'ffmpeg',
-            '-i', f'udp://{host_ip}:{port}?timeout=5000000',
-            '-f', 'rawvideo',
-            '-pix_fmt', 'bgr24',
-            '-vcodec', 'rawvideo',
-            '-fflags', 'nobuffer',
-            '-flags', 'low_delay',
-            '-avioflags', 'direct',
-            'pipe:1'
-        ]
-        
-        try:
-            print(f"🎬 Starting FFmpeg: {' '.join(ffmpeg_cmd)}")
-            
-            self.ffmpeg_process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=frame_size * 5
-            )
-            
-            print("✅ FFmpeg process started successfully")
-            
-            # Start stderr reader thread
-            stderr_thread = threading.Thread(target=self._read_stderr, daemon=True)
-            stderr_thread.start()
-            
-            while self.running and self.ffmpeg_process.poll() is None:
-                try:
-                    # Read raw frame data from FFmpeg
-                    raw_frame = self.ffmpeg_process.stdout.read(frame_size)
-                    
-                    if len(raw_frame) == frame_size:
-                        # Convert to numpy array and reshape
-                        frame = np.frombuffer(raw_frame, np.uint8)
-                        frame = frame.reshape((height, width, 3))
-                        self._handle_decoded_frame(frame)
-                    else:
-                        # Incomplete frame or no data
-                        if len(raw_frame) == 0:
-                            time.sleep(0.001)
-                        else:
-                            print(f"⚠️ Incomplete frame: {len(raw_frame)}/{frame_size} bytes")
-                            
-                except Exception as e:
-                    print(f"FFmpeg frame error: {e}")
-                    time.sleep(0.01)
-                    
-        except Exception as e:
-            print(f"❌ FFmpeg process error: {e}")
-            self.connected = False
-            self._create_error_frame(f"FFmpeg Error: {str(e)}")
-        finally:
-            if self.ffmpeg_process:
-                self.ffmpeg_process.terminate()
-    
-    def _read_stderr(self):
-        """Read FFmpeg stderr for debugging"""
-        while self.running and self.ffmpeg_process and self.ffmpeg_process.poll() is None:
-            try:
-                line = self.ffmpeg_process.stderr.readline()
-                if line:
-                    print(f"FFmpeg (client): {line.decode().strip()}")
-            except:
-                break
-    
-    def _handle_decoded_frame(self, frame):
-        """Handle successfully decoded frame"""
-        self.current_frame = frame
-        self.frame_count += 1
-        
-        # Update FPS counter
-        current_time = time.time()
-        if current_time - self.fps_update_time >= 1.0:
-            self.fps = self.frame_count
-            self.frame_count = 0
-            self.fps_update_time = current_time
-        
-        # Put in queue
-        if not self.frame_queue.full():
-            try:
-                self.frame_queue.put_nowait(frame)
-            except queue.Full:
-                pass
-        
-        # Call callback
-        if self.on_frame_callback:
-            self.on_frame_callback(frame)
-    
-    def _create_error_frame(self, message):
-        """Create error frame when FFmpeg fails"""
-        if not CV2_AVAILABLE:
-            return
-            
-        try:
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            frame[:] = [40, 40, 120]  # Blue background
-            
-            # Add error text
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            cv2.putText(frame, "EDGELITE CLIENT", (30, 60), font, 0.7, (255, 255, 255), 2)
-            cv2.putText(frame, message, (30, 120), font, 0.6, (255, 255, 255), 1)
-            cv2.putText(frame, "Troubleshooting:", (30, 180), font, 0.6, (255, 255, 255), 1)
-            cv2.putText(frame, "1. Check if host is running", (30, 210), font, 0.5, (255, 255, 255), 1)
-            cv2.putText(frame, "2. Verify host IP and port", (30, 240), font, 0.5, (255, 255, 255), 1)
-            cv2.putText(frame, "3. Check firewall settings", (30, 270), font, 0.5, (255, 255, 255), 1)
-            cv2.putText(frame, "4. Ensure FFmpeg is installed", (30, 300), font, 0.5, (255, 255, 255), 1)
-            
-            self._handle_decoded_frame(frame)
-        except Exception as e:
-            print(f"Error frame creation failed: {e}")
-    
-    def get_frame(self):
-        """Get the latest video frame"""
-        try:
-            # Get latest frame from queue
-            if not self.frame_queue.empty():
-                self.current_frame = self.frame_queue.get_nowait()
-            return self.current_frame
-        except:
-            return self.current_frame
-    
-    def get_stats(self) -> dict:
-        """Get streaming statistics"""
-        return {
-            'fps': self.fps,
-            'connected': self.connected,
-            'decoder': 'ffmpeg',
-            'queue_size': self.frame_queue.qsize(),
-            'platform': self.platform
-        }
-    
-    def set_frame_callback(self, callback: Callable):
-        """Set callback for new frames"""
-        self.on_frame_callback = callback
-    
-    def disconnect(self):
-        """Disconnect from stream"""
-        self.running = False
-        self.connected = False
-        if self.ffmpeg_process:
-            try:
-                self.ffmpeg_process.terminate()
-                self.ffmpeg_process.wait(timeout=2.0)
-            except:
-                try:
-                    self.ffmpeg_process.kill()
-                except:
-                    pass
-        print("✅ FFmpeg receiver disconnected")
-
-# ========== INPUT SENDER ==========
-class CrossPlatformInputSender:
-    def __init__(self, control_port: int = 5556):
-        self.control_port = control_port
-        self.host_ip = None
-        self.socket = None
-        self.mouse_listener = None
-        self.keyboard_listener = None
-        self.running = False
-        
-        self.mouse_position = (0, 0)
-        self.pressed_keys = set()
-        
-        # Client display dimensions for scaling
-        self.display_width = 1920
-        self.display_height = 1080
-        self.stream_width = 1280
-        self.stream_height = 720
-        
-        self.platform = platform.system().lower()
-        self.input_enabled = PYNPUT_AVAILABLE
-        
-        if not self.input_enabled:
-            print("Input forwarding disabled - install pynput to enable")
-    
-    def set_scaling(self, display_width: int, display_height: int, stream_width: int, stream_height: int):
-        """Set scaling for coordinate conversion"""
-        self.display_width = display_width
-        self.display_height = display_height
-        self.stream_width = stream_width
-        self.stream_height = stream_height
-        print(f"Input scaling set: Display {display_width}x{display_height}, Stream {stream_width}x{stream_height}")
-    
-    def _scale_coordinates(self, x: int, y: int) -> tuple:
-        """Scale coordinates from display to stream resolution"""
-        if self.display_width > 0 and self.display_height > 0:
-            scaled_x = int(x * self.stream_width / self.display_width)
-            scaled_y = int(y * self.stream_height / self.display_height)
-            return scaled_x, scaled_y
-        return x, y
-    
-    def connect(self, host_ip: str):
-        """Connect to host input receiver"""
-        try:
-            self.host_ip = host_ip
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.socket.settimeout(1.0)
-            
-            if self.input_enabled:
-                self._start_input_listeners()
-            else:
-                print("Input forwarding not available")
-            
-            print(f"✅ Input sender connected to {host_ip}")
-            return True
-        except Exception as e:
-            print(f"❌ Input sender connection error: {e}")
-            return False
-    
-    def _start_input_listeners(self):
-        """Start listening for input events"""
-        if not self.input_enabled:
-            return
-            
-        self.running = True
-        
-        self.mouse_listener = mouse.Listener(
-            on_move=self._on_mouse_move,
-            on_click=self._on_mouse_click,
-            on_scroll=self._on_mouse_scroll
-        )
-        
-        self.keyboard_listener = keyboard.Listener(
-            on_press=self._on_key_press,
-            on_release=self._on_key_release
-        )
-        
-        self.mouse_listener.start()
-        self.keyboard_listener.start()
-        
-        print("✅ Input listeners started")
-    
-    def _send_input_event(self, event_data: dict):
-        """Send input event to host"""
-        if self.socket and self.host_ip and self.running:
-            try:
-                data = json.dumps(event_data).encode('utf-8')
-                self.socket.sendto(data, (self.host_ip, self.control_port))
-            except Exception as e:
-                print(f"Input send error: {e}")
-    
-    def _on_mouse_move(self, x: int, y: int):
-        """Handle mouse movement"""
-        if not self.running:
-            return
-            
-        self.mouse_position = (x, y)
-        
-        # Scale coordinates
-        scaled_x, scaled_y = self._scale_coordinates(x, y)
-        
-        event = {
-            'type': 'mouse',
-            'action': 'move',
-            'x': scaled_x,
-            'y': scaled_y,
-            'timestamp': time.time()
-        }
-        self._send_input_event(event)
-    
-    def _on_mouse_click(self, x: int, y: int, button, pressed: bool):
-        """Handle mouse clicks"""
-        if not self.running:
-            return
-            
-        button_name = str(button).replace('Button.', '')
-        
-        # Scale coordinates
-        scaled_x, scaled_y = self._scale_coordinates(x, y)
-        
-        event = {
-            'type': 'mouse',
-            'action': 'press' if pressed else 'release',
-            'button': button_name,
-            'x': scaled_x,
-            'y': scaled_y,
-            'timestamp': time.time()
-        }
-        self._send_input_event(event)
-    
-    def _on_mouse_scroll(self, x: int, y: int, dx: int, dy: int):
-        """Handle mouse scroll"""
-        if not self.running:
-            return
-            
-        # Scale coordinates
-        scaled_x, scaled_y = self._scale_coordinates(x, y)
-        
-        event = {
-            'type': 'mouse',
-            'action': 'scroll',
-            'x': scaled_x,
-            'y': scaled_y,
-            'dx': dx,
-            'dy': dy,
-            'timestamp': time.time()
-        }
-        self._send_input_event(event)
-    
-    def _on_key_press(self, key):
-        """Handle key press"""
-        if not self.running:
-            return
-            
-        try:
-            key_str = self._key_to_string(key)
-            self.pressed_keys.add(key_str)
-            
-            event = {
-                'type': 'keyboard',
-                'action': 'press',
-                'key': key_str,
-                'timestamp': time.time()
-            }
-            self._send_input_event(event)
-            
-        except Exception as e:
-            print(f"Key press error: {e}")
-    
-    def _on_key_release(self, key):
-        """Handle key release"""
-        if not self.running:
-            return
-            
-        try:
-            key_str = self._key_to_string(key)
-            self.pressed_keys.discard(key_str)
-            
-            event = {
-                'type': 'keyboard',
-                'action': 'release',
-                'key': key_str,
-                'timestamp': time.time()
-            }
-            self._send_input_event(event)
-            
-        except Exception as e:
-            print(f"Key release error: {e}")
-    
-    def _key_to_string(self, key) -> str:
-        """Convert key to string representation"""
-        if hasattr(key, 'char') and key.char is not None:
-            return key.char
-        else:
-            return str(key).replace('Key.', '')
-    
-    def disconnect(self):
-        """Disconnect input sender"""
-        self.running = False
-        
-        if self.mouse_listener:
-            self.mouse_listener.stop()
-        if self.keyboard_listener:
-            self.keyboard_listener.stop()
-        if self.socket:
-            self.socket.close()
-
-# ========== VIDEO DISPLAY ==========
-class VideoDisplay:
-    def __init__(self, parent, width=1280, height=720):
-        self.parent = parent
-        self.width = width
-        self.height = height
-        self.current_image = None
-        
-        self.setup_display()
-    
-    def setup_display(self):
-        """Setup Tkinter video display using grid"""
-        self.frame = ttk.Frame(self.parent)
-        self.frame.pack(fill=tk.BOTH, expand=True)
-        
-        self.video_label = ttk.Label(
-            self.frame, 
-            text="Enter host IP and click Connect",
-            background='black',
-            foreground='white',
-            font=('Arial', 12),
-            anchor='center',
-            justify='center'
-        )
-        self.video_label.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
-    
-    def update_frame(self, frame, stats):
-        """Update the video display with new frame"""
-        if frame is None or not CV2_AVAILABLE:
-            return
-        
-        self._update_tkinter_frame(frame, stats)
-    
-    def _update_tkinter_frame(self, frame, stats):
-        """Update Tkinter display with new frame"""
-        try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(rgb_frame)
-            
-            display_width = self.video_label.winfo_width()
-            display_height = self.video_label.winfo_height()
-            
-            if display_width <= 1 or display_height <= 1:
-                display_width = self.width
-                display_height = self.height
-            
-            img.thumbnail((display_width, display_height), Image.Resampling.LANCZOS)
-            
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.video_label.configure(image=imgtk, text="")
-            self.video_label.image = imgtk
-            
-        except Exception as e:
-            print(f"Frame update error: {e}")
-    
-    def show_connecting(self):
-        """Show connecting state"""
-        self.video_label.configure(
-            image='',
-            text="Connecting to host...\n\nStarting FFmpeg receiver...",
-            background='black',
-            foreground='white'
-        )
-    
-    def show_error(self, message):
-        """Show error message"""
-        self.video_label.configure(
-            image='',
-            text=f"Error: {message}\n\nCheck host connection and try again",
-            background='darkred',
-            foreground='white'
-        )
-
-# ========== MAIN CLIENT GUI ==========
-class EdgeLiteClient:
-    def __init__(self):
-        self.config_manager = ConfigManager()
-        
-        # Check if FFmpeg is available
-        self.ffmpeg_available = self._check_ffmpeg()
-        
-        # Select receiver based on FFmpeg availability
-        if self.ffmpeg_available:
-            self.receiver = FFmpegVideoReceiver(self.config_manager)
-            print("🔧 Using FFmpeg H.264 video receiver")
-        else:
-            from SimpleVideoReceiver import SimpleVideoReceiver
-            self.receiver = SimpleVideoReceiver(self.config_manager)
-            print("🔧 Using simple video receiver (FFmpeg not available)")
-            
-        self.input_sender = CrossPlatformInputSender(self.config_manager.network_config.control_port)
-        
-        self.connected = False
-        self.connection_start_time = 0
-        self.host_ip = None
-        self.is_fullscreen = False
-        
-        self.root = None
-        self.log_text = None
-        self.connect_btn = None
-        self.connection_status = None
-        self.video_display = None
-        self.notebook = None
-        self.video_tab = None
-        self.controls_tab = None
-        
-        self.setup_gui()
-        self.receiver.set_frame_callback(self.on_new_frame)
-    
-    def _check_ffmpeg(self):
-        """Check if FFmpeg is available on the system"""
-        try:
-            result = subprocess.run(['ffmpeg', '-version'], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=5)
-            if result.returncode == 0:
-                print("✅ FFmpeg is available")
-                return True
-            else:
-                print("❌ FFmpeg check failed")
-                return False
-        except:
-            print("❌ FFmpeg not found in system PATH")
-            return False
-    
-    def setup_gui(self):
-        """Setup the main client GUI with tabs"""
-        self.root = tk.Tk()
-        self.root.title("EdgeLite Client - FFmpeg H.264")
-        self.root.geometry("1024x768")
-        
-        # Bind F11 for fullscreen toggle
-        self.root.bind('<F11>', self.toggle_fullscreen)
-        self.root.bind('<Escape>', self.exit_fullscreen)
-        
-        # Create notebook (tabbed interface)
-        self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Video Tab
-        self.video_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.video_tab, text='Video')
-        
-        # Controls Tab
-        self.controls_tab = ttk.Frame(self.notebook)
-        self.notebook.add(self.controls_tab, text='Controls')
-        
-        # Setup video display in video tab
-        self.setup_video_tab()
-        
-        # Setup controls in controls tab
-        self.setup_controls_tab()
-        
-        self.setup_platform_input()
-        
-        self.log("✅ EdgeLite FFmpeg H.264 Client Started")
-        self.log(f"🌍 Platform: {platform.system()} {platform.release()}")
-        
-        if self.ffmpeg_available:
-            self.log("🔧 Using FFmpeg H.264 decoder with UDP")
-        else:
-            self.log("⚠️ Using simple receiver - FFmpeg not available")
-            self.log("💡 Install FFmpeg for better video performance:")
-            self.log("   Windows: download from ffmpeg.org")
-            self.log("   macOS: brew install ffmpeg")
-            self.log("   Linux: sudo apt install ffmpeg")
-        
-        self.log("💡 Enter host IP and click Connect")
-        self.log("💡 For testing, use 127.0.0.1 to connect to yourself")
-        self.log("💡 Press F11 to toggle fullscreen, ESC to exit fullscreen")
-        
-        if not CV2_AVAILABLE:
-            self.log("❌ WARNING: OpenCV/PIL not installed - video display disabled")
-            self.log("   Install with: pip install opencv-python Pillow")
-        if not PYNPUT_AVAILABLE:
-            self.log("❌ WARNING: pynput not installed - input forwarding disabled")
-            self.log("   Install with: pip install pynput")
-    
-    def setup_video_tab(self):
-        """Setup the video tab with display and status"""
-        # Video display
-        self.video_display = VideoDisplay(self.video_tab)
-        
-        # Status frame at bottom of video tab
-        status_frame = ttk.Frame(self.video_tab)
-        status_frame.pack(fill=tk.X, side=tk.BOTTOM)
-        
-        self.fps_label = ttk.Label(status_frame, text="FPS: 0")
-        self.fps_label.pack(side=tk.LEFT, padx=5)
-        
-        self.connection_label = ttk.Label(status_frame, text="FFmpeg Receiver")
-        self.connection_label.pack(side=tk.LEFT, padx=5)
-        
-        platform_info = f"{platform.system()} {platform.release()}"
-        self.platform_label = ttk.Label(status_frame, text=platform_info)
-        self.platform_label.pack(side=tk.RIGHT, padx=5)
-        
-        # Fullscreen hint
-        fullscreen_label = ttk.Label(status_frame, text="F11: Fullscreen | ESC: Exit Fullscreen")
-        fullscreen_label.pack(side=tk.RIGHT, padx=5)
-    
-    def setup_controls_tab(self):
-        """Setup the controls tab with connection controls and log"""
-        # Connection controls
-        control_frame = ttk.LabelFrame(self.controls_tab, text="Connection", padding="10")
-        control_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        ttk.Label(control_frame, text="Host IP:").grid(row=0, column=0, sticky="w", padx=(0, 5))
-        self.host_ip_var = tk.StringVar(value="127.0.0.1")
-        ip_entry = ttk.Entry(control_frame, textvariable=self.host_ip_var, width=15)
-        ip_entry.grid(row=0, column=1, sticky="ew", padx=(0, 5))
-        
-        self.connect_btn = ttk.Button(control_frame, text="Connect", command=self.toggle_connection)
-        self.connect_btn.grid(row=0, column=2, padx=(0, 5))
-        
-        self.connection_status = ttk.Label(control_frame, text="🔴 DISCONNECTED", foreground="red", font=('Arial', 9, 'bold'))
-        self.connection_status.grid(row=0, column=3, padx=(10, 0))
-        
-        control_frame.columnconfigure(1, weight=1)
-        
-        # Settings frame
-        settings_frame = ttk.LabelFrame(self.controls_tab, text="Settings", padding="10")
-        settings_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Input control checkbox
-        self.input_enabled_var = tk.BooleanVar(value=True)
-        input_checkbox = ttk.Checkbutton(
-            settings_frame, 
-            text="Enable Input Control", 
-            variable=self.input_enabled_var,
-            command=self.toggle_input_control
-        )
-        input_checkbox.pack(anchor=tk.W)
-        
-        input_info = ttk.Label(
-            settings_frame, 
-            text="When enabled: Click the video display to control host computer",
-            foreground="gray",
-            font=('Arial', 8)
-        )
-        input_info.pack(anchor=tk.W, pady=(0, 5))
-        
-        # Log frame
-        log_frame = ttk.LabelFrame(self.controls_tab, text="Connection Log", padding="5")
-        log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        self.log_text = tk.Text(log_frame, height=10)
-        self.log_text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
-        
-        log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
-        log_scrollbar.pack(fill=tk.Y, side=tk.RIGHT)
-        self.log_text.configure(yscrollcommand=log_scrollbar.set)
-    
-    def setup_platform_input(self):
-        """Setup input forwarding with proper focus handling"""
-        if hasattr(self.video_display, 'video_label'):
-            # Bind focus events to video display
-            self.video_display.video_label.bind('<Enter>', self.on_video_focus)
-            self.video_display.video_label.bind('<Leave>', self.on_video_blur)
-            self.video_display.video_label.bind('<Button-1>', self.on_video_click)
-            
-            # Make video label focusable
-            self.video_display.video_label.focus_set()
-    
-    def toggle_input_control(self):
-        """Toggle input control on/off"""
-        if self.input_enabled_var.get():
-            self.log("✅ Input control enabled")
-            if self.connected:
-                self.input_sender.connect(self.host_ip)
-        else:
-            self.log("❌ Input control disabled")
-            self.input_sender.disconnect()
-    
-    def on_video_click(self, event):
-        """When video display is clicked, focus it"""
-        self.video_display.video_label.focus_set()
-        if self.input_enabled_var.get():
-            self.log("🎯 Video display focused - input forwarding active")
-        
-    def on_video_focus(self, event):
-        """When video display gets focus"""
-        if self.connected and self.input_enabled_var.get():
-            self.log("🎯 Video display focused - input forwarding active")
-            self.log("🖱️  You can now control the host computer")
-            self.log("💡 Click anywhere outside the video to release control")
-    
-    def on_video_blur(self, event):
-        """When video display loses focus"""
-        if self.connected and self.input_enabled_var.get():
-            self.log("🎯 Video display unfocused - input forwarding inactive")
-    
-    def toggle_fullscreen(self, event=None):
-        """Toggle fullscreen mode"""
-        self.is_fullscreen = not self.is_fullscreen
-        self.root.attributes('-fullscreen', self.is_fullscreen)
-        
-        if self.is_fullscreen:
-            # Hide the notebook and show only video
-            self.notebook.pack_forget()
-            self.video_tab.pack(fill=tk.BOTH, expand=True)
-            self.log("📺 Entered fullscreen mode (Press ESC to exit)")
-        else:
-            # Show the notebook again
-            self.video_tab.pack_forget()
-            self.notebook.pack(fill=tk.BOTH, expand=True)
-            self.log("📺 Exited fullscreen mode")
-    
-    def exit_fullscreen(self, event=None):
-        """Exit fullscreen mode"""
-        if self.is_fullscreen:
-            self.toggle_fullscreen()
-    
-    def on_new_frame(self, frame):
-        """Callback for new video frames"""
-        if hasattr(self, 'video_display'):
-            stats = self.receiver.get_stats()
-            self.root.after(0, self.update_display, frame, stats)
-    
-    def update_display(self, frame, stats):
-        """Update video display and stats in main thread"""
-        if self.video_display:
-            self.video_display.update_frame(frame, stats)
-        
-        # Update status labels
-        self.fps_label.config(text=f"FPS: {stats.get('fps', 0)}")
-        
-        if self.connected and stats['connected']:
-            connection_time = time.time() - self.connection_start_time
-            status_text = f"🟢 CONNECTED ({int(connection_time)}s)"
-            self.connection_status.config(text=status_text, foreground="green")
-            self.connection_label.config(text="🟢 Streaming", foreground="green")
-        else:
-            if self.connected and not stats['connected']:
-                self.connected = False
-                self.connect_btn.config(text="Connect")
-                self.connection_status.config(text="🔴 CONNECTION LOST", foreground="red")
-                self.connection_label.config(text="🔴 Disconnected", foreground="red")
-                self.log("❌ Connection lost - video stream disconnected")
-                self.video_display.show_error("Connection lost")
-    
-    def toggle_connection(self):
-        """Connect or disconnect from host"""
-        if not self.connected:
-            self.connect_to_host()
-        else:
-            self.disconnect_from_host()
-    
-    def connect_to_host(self):
-        """Connect to selected host"""
-        host_ip = self.host_ip_var.get().strip()
-        if not host_ip:
-            messagebox.showerror("Error", "Please enter host IP address")
-            return
-        
-        if not CV2_AVAILABLE:
-            messagebox.showerror("Error",
-                "OpenCV/PIL not installed!\n\n"
-                "Video display requires OpenCV and PIL.\n"
-                "Install with: pip install opencv-python Pillow")
-            return
-        
-        self.log(f"🔗 Connecting to {host_ip}...")
-        self.video_display.show_connecting()
-        
-        self.connection_status.config(text="🟡 CONNECTING...", foreground="orange")
-        self.connect_btn.config(state="disabled")
-        
-        def connect_thread():
-            success = self.receiver.connect(host_ip)
-            self.root.after(0, self._connection_result, success, host_ip)
-        
-        threading.Thread(target=connect_thread, daemon=True).start()
-    
-    def _connection_result(self, success, host_ip):
-        self.connect_btn.config(state="normal")
-        
-        if success:
-            self.connected = True
-            self.connection_start_time = time.time()
-            self.host_ip = host_ip
-            
-            self.connect_btn.config(text="Disconnect")
-            self.connection_status.config(text="🟢 CONNECTED", foreground="green")
-            
-            # Setup input scaling with proper dimensions
-            display_width = self.video_display.video_label.winfo_width()
-            display_height = self.video_display.video_label.winfo_height()
-            
-            # If video label dimensions are not available yet, use default
-            if display_width <= 1 or display_height <= 1:
-                display_width = 1280
-                display_height = 720
-            
-            stream_config = self.config_manager.stream_config
-            self.input_sender.set_scaling(
-                display_width, display_height,
-                stream_config.width,
-                stream_config.height
-            )
-            
-            # Start input sender if enabled
-            if self.input_enabled_var.get():
-                input_success = self.input_sender.connect(host_ip)
-                if input_success:
-                    self.log("✅ Input control initialized")
-                else:
-                    self.log("⚠️ Input control failed to start")
-            
-            self.log(f"✅ Successfully connected to {host_ip}")
-            if self.ffmpeg_available:
-                self.log("🔧 Using FFmpeg H.264 decoder")
-            else:
-                self.log("🔧 Using simple UDP receiver")
-            
-            if self.input_enabled_var.get():
-                self.log("🎯 Click the video display to start controlling the host")
-            self.log("📺 Waiting for video stream...")
-            
-        else:
-            self.connection_status.config(text="🔴 CONNECTION FAILED", foreground="red")
-            self.video_display.show_error(f"Cannot connect to {host_ip}")
-            self.log(f"❌ Failed to connect to {host_ip}")
-            
-            error_msg = f"Failed to connect to {host_ip}\n\nPossible issues:\n"
-            error_msg += "• Host IP address is incorrect\n"
-            error_msg += "• Host is not running EdgeLite\n"
-            error_msg += "• Host firewall is blocking connection\n"
-            error_msg += "• Make sure host has started streaming\n"
-            
-            if not self.ffmpeg_available:
-                error_msg += "• FFmpeg is not installed on client\n"
-            
-            messagebox.showerror("Connection Failed", error_msg)
-    
-    def disconnect_from_host(self):
-        """Disconnect from host"""
-        self.log("🔌 Disconnecting from host...")
-        
-        self.receiver.disconnect()
-        self.input_sender.disconnect()
-        
-        self.connected = False
-        self.connect_btn.config(text="Connect")
-        self.connection_status.config(text="🔴 DISCONNECTED", foreground="red")
-        self.connection_label.config(text="🔴 Disconnected", foreground="red")
-        
-        if self.video_display:
-            self.video_display.video_label.configure(
-                image='',
-                text="Disconnected\n\n" +
-                     "Enter host IP and click Connect to reconnect",
-                background='black',
-                foreground='white'
-            )
-        
-        self.log("✅ Disconnected from host")
-        self.log("💡 Ready for new connection")
-    
-    def log(self, message: str):
-        """Add message to log"""
-        try:
-            timestamp = time.strftime('%H:%M:%S')
-            if self.log_text:
-                self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-                self.log_text.see(tk.END)
-            else:
-                print(f"[{timestamp}] {message}")
-        except Exception as e:
-            print(f"Log error: {e}")
-            print(f"Message: {message}")
-    
-    def run(self):
-        """Start the client application"""
-        try:
-            self.update_stats()
-            self.root.mainloop()
-        except KeyboardInterrupt:
-            self.cleanup()
-        finally:
-            self.cleanup()
-    
-    def update_stats(self):
-        """Periodically update statistics"""
-        if self.connected:
-            stats = self.receiver.get_stats()
-            self.update_display(None, stats)
-            
-            if not stats['connected']:
-                self.connected = False
-                self.connect_btn.config(text="Connect")
-                self.connection_status.config(text="🔴 CONNECTION LOST", foreground="red")
-                self.connection_label.config(text="🔴 Disconnected", foreground="red")
-                self.log("❌ Connection lost with host")
-        
-        self.root.after(1000, self.update_stats)
-    
-    def cleanup(self):
-        """Cleanup resources"""
-        self.connected = False
-        self.receiver.disconnect()
-        self.input_sender.disconnect()
-
-# ========== MAIN ENTRY POINT ==========
-def main():
-    """Main entry point"""
-    print(f"🌍 Platform: {platform.system()} {platform.release()}")
-    print(f"🐍 Python: {platform.python_version()}")
-    print("🚀 Starting EdgeLite FFmpeg H.264 Client")
-    
-    if not CV2_AVAILABLE:
-        print("❌ CRITICAL: OpenCV and PIL are required for video display")
-        response = input("   Install now? (y/n): ")
-        if response.lower() == 'y':
-            os.system("pip install opencv-python Pillow")
-            print("✅ Please restart the application")
-            return
-    
-    try:
-        app = EdgeLiteClient()
-        app.run()
-    except Exception as e:
-        print(f"💥 Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
-        input("Press Enter to exit...")
-
-if __name__ == "__main__":
-    main()
+import tkinter as tk
+from tkinter import ttk, messagebox
+import threading
+import time
+import queue
+import struct
+import functools
+import socket
+import collections
+import platform
+import sys
+import os
+import subprocess
+from typing import Optional, Callable
+
+# ========== PLATFORM-SPECIFIC IMPORTS ==========
+try:
+    import cv2
+    import numpy as np
+    from PIL import Image, ImageTk
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    print("OpenCV/PIL not available - video display disabled")
+
+try:
+    from pynput import mouse, keyboard
+    PYNPUT_AVAILABLE = True
+except ImportError:
+    PYNPUT_AVAILABLE = False
+    print("pynput not available - input forwarding disabled")
+
+# platform.system() can shell out on some platforms; resolve once
+_PLATFORM = platform.system().lower()
+
+# ========== CONFIGURATION ==========
+class StreamConfig:
+    def __init__(self):
+        self.width = 1280
+        self.height = 720
+        self.fps = 30
+        self.bitrate = "1M"
+
+class NetworkConfig:
+    def __init__(self):
+        self.video_port = 5555
+        self.control_port = 5556
+        self.discovery_port = 5557
+        # Socket tuning: OS default UDP buffers drop bursty traffic, and
+        # DSCP EF (46) puts the stream on the network's priority queue
+        self.udp_sndbuf = 4 * 1024 * 1024
+        self.udp_rcvbuf = 4 * 1024 * 1024
+        self.dscp = 46
+        # Linux qdisc band (TC_PRIO_INTERACTIVE); ignored elsewhere
+        self.so_priority = 6
+
+class ConfigManager:
+    def __init__(self):
+        self.stream_config = StreamConfig()
+        self.network_config = NetworkConfig()
+
+def apply_socket_tuning(sock, net_config):
+    """Apply configured UDP buffer sizes and DSCP tag to a socket.
+
+    Each option fails soft: platforms cap buffer sizes or reject IP_TOS,
+    and a missed tweak shouldn't stop the stream.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, net_config.udp_sndbuf)
+    except OSError:
+        pass
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, net_config.udp_rcvbuf)
+    except OSError:
+        pass
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, net_config.dscp << 2)
+    except (OSError, AttributeError):
+        pass
+    try:
+        # DSCP covers the network; SO_PRIORITY covers the local qdisc,
+        # so bursts of bulk traffic on this box can't queue ahead of us
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, net_config.so_priority)
+    except (OSError, AttributeError):
+        pass
+
+# ========== FFMPEG VIDEO RECEIVER ==========
+class FFmpegVideoReceiver:
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.connected = False
+        self.running = False
+        # Single-slot queue with newest-wins replacement: display only ever
+        # wants the latest frame, so depth just adds latency
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.current_frame = None
+        self.frame_count = 0
+        # Rolling window of arrival timestamps; FPS is derived lazily in
+        # get_stats instead of being maintained on the decode hot path
+        self._frame_times = collections.deque(maxlen=120)
+        # get_stats runs once per displayed frame; mutate one dict in
+        # place rather than allocating a fresh one each call
+        self._stats = {
+            'fps': 0,
+            'connected': False,
+            'decoder': 'ffmpeg',
+            'queue_size': 0,
+            'platform': _PLATFORM,
+        }
+        self.on_frame_callback = None
+        self.ffmpeg_process = None
+        self.decoder_thread = None
+        self.dispatch_thread = None
+        # Hardware decode acceleration: probed once on first connect,
+        # '' after probing means software decode
+        self._hwaccel = None
+        
+        self.platform = _PLATFORM
+        print(f"Platform: {self.platform}")
+        
+    def connect(self, host_ip: str) -> bool:
+        """Connect to host using FFmpeg for H.264 decoding"""
+        try:
+            self.running = True
+            self.connected = True
+            
+            # Start FFmpeg in a thread
+            self.decoder_thread = threading.Thread(
+                target=self._ffmpeg_receive_loop, 
+                args=(host_ip,),
+                daemon=True
+            )
+            self.decoder_thread.start()
+
+            # Callback work runs here so the reader thread only ever
+            # drains the pipe
+            self.dispatch_thread = threading.Thread(
+                target=self._dispatch_loop,
+                daemon=True
+            )
+            self.dispatch_thread.start()
+
+            print(f"✅ FFmpeg receiver started for {host_ip}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ FFmpeg connection failed: {e}")
+            return False
+    
+    def _detect_hwaccel(self):
+        """Pick a usable ffmpeg hwaccel, or None for software decode.
+
+        The generic -hwaccel path is preferred over the codec-specific
+        *_cuvid decoders: ffmpeg manages frame ordering itself and
+        hands back system-memory frames we can pipe out as usual.
+        Candidates are tried in per-platform priority order against
+        what this ffmpeg build actually reports, so a build compiled
+        without a given accelerator simply falls through.
+        """
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-hwaccels'],
+                                    capture_output=True, timeout=5)
+            available = result.stdout.decode().split()
+        except Exception:
+            return None
+        if _PLATFORM == 'windows':
+            preferred = ['cuda', 'd3d11va', 'dxva2']
+        elif _PLATFORM == 'darwin':
+            preferred = ['videotoolbox']
+        else:
+            preferred = ['cuda', 'vaapi', 'vdpau']
+        for name in preferred:
+            if name in available:
+                return name
+        return None
+
+    def _ffmpeg_receive_loop(self, host_ip):
+        """FFmpeg reception and decoding loop"""
+        width = self.config_manager.stream_config.width
+        height = self.config_manager.stream_config.height
+        port = self.config_manager.network_config.video_port
+        # RGBA straight from ffmpeg: the display's PIL image wants RGBA
+        # anyway, so the channel conversion happens in the decoder
+        # subprocess (own core) instead of on the Tk thread. Costs a
+        # third more pipe bandwidth, which is cheap next to a
+        # full-frame swizzle per displayed frame.
+        frame_size = width * height * 4
+
+        if self._hwaccel is None:
+            self._hwaccel = self._detect_hwaccel() or ''
+        hw_args = ['-hwaccel', self._hwaccel] if self._hwaccel else []
+
+        # FFmpeg command to receive UDP stream and decode to raw video
+        ffmpeg_cmd = [
+            'ffmpeg',
+            # Decoder threading (must precede -i): slice threading
+            # splits work within each frame, so it parallelizes without
+            # the N-frame latency frame-threading would add; -threads 0
+            # sizes the pool to the machine
+            '-threads', '0',
+            '-thread_type', 'slice',
+            *hw_args,
+            '-i', f'udp://{host_ip}:{port}?timeout=5000000',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgba',
+            '-vcodec', 'rawvideo',
+            '-fflags', 'nobuffer',
+            '-flags', 'low_delay',
+            '-avioflags', 'direct',
+            'pipe:1'
+        ]
+        
+        try:
+            print(f"🎬 Starting FFmpeg: {' '.join(ffmpeg_cmd)}")
+            
+            self.ffmpeg_process = subprocess.Popen(
+                ffmpeg_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=frame_size * 5
+            )
+            
+            print("✅ FFmpeg process started successfully")
+            
+            # Start stderr reader thread
+            stderr_thread = threading.Thread(target=self._read_stderr, daemon=True)
+            stderr_thread.start()
+            
+            # Rotating preallocated buffers: readinto fills them in place,
+            # so no 6MB bytes object is allocated per frame, and the frame
+            # handed out stays valid while the next two are being read
+            buffers = [bytearray(frame_size) for _ in range(3)]
+            buf_idx = 0
+            reader = self.ffmpeg_process.stdout
+
+            while self.running and self.ffmpeg_process.poll() is None:
+                try:
+                    buf = buffers[buf_idx]
+                    view = memoryview(buf)
+                    filled = 0
+                    # Pipes return short reads; keep filling until we have
+                    # a whole frame instead of dropping and losing sync
+                    while filled < frame_size and self.running:
+                        n = reader.readinto(view[filled:])
+                        if not n:
+                            if self.ffmpeg_process.poll() is not None:
+                                break
+                            time.sleep(0.001)
+                            continue
+                        filled += n
+
+                    if filled == frame_size:
+                        frame = np.frombuffer(buf, np.uint8).reshape((height, width, 4))
+                        self._handle_decoded_frame(frame)
+                        buf_idx = (buf_idx + 1) % 3
+
+                except Exception as e:
+                    print(f"FFmpeg frame error: {e}")
+                    time.sleep(0.01)
+                    
+        except Exception as e:
+            print(f"❌ FFmpeg process error: {e}")
+            self.connected = False
+            self._create_error_frame(f"FFmpeg Error: {str(e)}")
+        finally:
+            if self.ffmpeg_process:
+                self.ffmpeg_process.terminate()
+    
+    def _read_stderr(self):
+        """Read FFmpeg stderr for debugging"""
+        while self.running and self.ffmpeg_process and self.ffmpeg_process.poll() is None:
+            try:
+                line = self.ffmpeg_process.stderr.readline()
+                if line:
+                    print(f"FFmpeg (client): {line.decode().strip()}")
+            except:
+                break
+    
+    def _handle_decoded_frame(self, frame):
+        """Publish a decoded frame; runs on the pipe reader thread.
+
+        Deliberately minimal: if the reader thread dawdles, ffmpeg's
+        stdout backs up, ffmpeg stalls, and its UDP receive buffer
+        overflows and drops packets. Callback work happens on the
+        dispatch thread instead.
+        """
+        self.current_frame = frame
+        self.frame_count += 1
+        self._frame_times.append(time.monotonic())
+
+        # Replace whatever is in the slot with the newest frame
+        try:
+            self.frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self.frame_queue.put_nowait(frame)
+        except queue.Full:
+            pass
+
+    def _dispatch_loop(self):
+        """Deliver frames to the callback off the reader thread"""
+        while self.running:
+            try:
+                frame = self.frame_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if self.on_frame_callback:
+                try:
+                    self.on_frame_callback(frame)
+                except Exception as e:
+                    print(f"Frame callback error: {e}")
+
+    def _create_error_frame(self, message):
+        """Create error frame when FFmpeg fails"""
+        if not CV2_AVAILABLE:
+            return
+            
+        try:
+            frame = np.zeros((480, 640, 3), dtype=np.uint8)
+            frame[:] = [40, 40, 120]  # Blue background
+            
+            # Add error text
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            cv2.putText(frame, "EDGELITE CLIENT", (30, 60), font, 0.7, (255, 255, 255), 2)
+            cv2.putText(frame, message, (30, 120), font, 0.6, (255, 255, 255), 1)
+            cv2.putText(frame, "Troubleshooting:", (30, 180), font, 0.6, (255, 255, 255), 1)
+            cv2.putText(frame, "1. Check if host is running", (30, 210), font, 0.5, (255, 255, 255), 1)
+            cv2.putText(frame, "2. Verify host IP and port", (30, 240), font, 0.5, (255, 255, 255), 1)
+            cv2.putText(frame, "3. Check firewall settings", (30, 270), font, 0.5, (255, 255, 255), 1)
+            cv2.putText(frame, "4. Ensure FFmpeg is installed", (30, 300), font, 0.5, (255, 255, 255), 1)
+            
+            self._handle_decoded_frame(frame)
+        except Exception as e:
+            print(f"Error frame creation failed: {e}")
+    
+    def get_frame(self):
+        """Latest decoded frame, newest-wins.
+
+        A plain reference read: current_frame is published atomically
+        by the reader thread, so there's no queue to drain here - and
+        draining would race the dispatch thread for its wake-up slot.
+        """
+        return self.current_frame
+    
+    def _current_fps(self):
+        times = self._frame_times
+        if len(times) < 2:
+            return 0
+        span = times[-1] - times[0]
+        if span <= 0 or time.monotonic() - times[-1] > 2.0:
+            return 0
+        return round((len(times) - 1) / span)
+
+    def get_stats(self) -> dict:
+        """Get streaming statistics"""
+        stats = self._stats
+        stats['fps'] = self._current_fps()
+        stats['connected'] = self.connected
+        stats['queue_size'] = self.frame_queue.qsize()
+        return stats
+    
+    def set_frame_callback(self, callback: Callable):
+        """Set callback for new frames"""
+        self.on_frame_callback = callback
+    
+    def disconnect(self):
+        """Disconnect from stream"""
+        self.running = False
+        self.connected = False
+        if self.ffmpeg_process:
+            try:
+                self.ffmpeg_process.terminate()
+                self.ffmpeg_process.wait(timeout=2.0)
+            except:
+                try:
+                    self.ffmpeg_process.kill()
+                except:
+                    pass
+        print("✅ FFmpeg receiver disconnected")
+
+# ========== INPUT WIRE FORMAT ==========
+# One fixed 26-byte little-endian record per event instead of JSON text.
+# json.dumps + encode dominated CPU on high-polling-rate mice and made
+# packets ~4x larger than needed. Layout:
+#   B  type      1=mouse 2=keyboard
+#   B  action    mouse: 0=move 1=press 2=release 3=scroll
+#                keyboard: 0=press 1=release
+#   i  f1        mouse: x          keyboard: key code (ord or special id)
+#   i  f2        mouse: y          keyboard: 1 if special key else 0
+#   i  f3        mouse: button id (press/release) or dx (scroll)
+#   i  f4        mouse: dy (scroll)
+#   Q  timestamp_ns
+INPUT_EVENT_STRUCT = struct.Struct('<BBiiiiQ')
+
+EVENT_MOUSE = 1
+EVENT_KEYBOARD = 2
+MOUSE_MOVE, MOUSE_PRESS, MOUSE_RELEASE, MOUSE_SCROLL = 0, 1, 2, 3
+KEY_PRESS, KEY_RELEASE = 0, 1
+
+BUTTON_IDS = {'left': 1, 'right': 2, 'middle': 3}
+
+# Monotonic is cheaper than wall time on some platforms and returns an
+# int directly; the host only compares event timestamps to each other
+_now_ns = time.monotonic_ns
+
+# Stable ids for pynput special-key names; single characters go over the
+# wire as their ordinal with the special flag clear
+SPECIAL_KEY_NAMES = [
+    'alt', 'alt_l', 'alt_r', 'alt_gr', 'backspace', 'caps_lock',
+    'cmd', 'cmd_l', 'cmd_r', 'ctrl', 'ctrl_l', 'ctrl_r', 'delete',
+    'down', 'end', 'enter', 'esc', 'f1', 'f2', 'f3', 'f4', 'f5', 'f6',
+    'f7', 'f8', 'f9', 'f10', 'f11', 'f12', 'f13', 'f14', 'f15', 'f16',
+    'f17', 'f18', 'f19', 'f20', 'home', 'insert', 'left',
+    'media_next', 'media_play_pause', 'media_previous',
+    'media_volume_down', 'media_volume_mute', 'media_volume_up',
+    'menu', 'num_lock', 'page_down', 'page_up', 'pause', 'print_screen',
+    'right', 'scroll_lock', 'shift', 'shift_l', 'shift_r', 'space',
+    'tab', 'up',
+]
+SPECIAL_KEY_IDS = {name: i + 1 for i, name in enumerate(SPECIAL_KEY_NAMES)}
+
+# Enum -> value maps so the hot pynput callbacks do a single dict lookup
+# instead of building a fresh string with str(enum).replace() per event
+if PYNPUT_AVAILABLE:
+    BUTTON_ID_BY_ENUM = {b: BUTTON_IDS.get(b.name, 0) for b in mouse.Button}
+    KEY_NAME_BY_ENUM = {k: k.name for k in keyboard.Key}
+else:
+    BUTTON_ID_BY_ENUM = {}
+    KEY_NAME_BY_ENUM = {}
+
+# ========== INPUT SENDER ==========
+class CrossPlatformInputSender:
+    def __init__(self, control_port: int = 5556, net_config=None):
+        self.control_port = control_port
+        self.net_config = net_config or NetworkConfig()
+        self.host_ip = None
+        self.socket = None
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self.running = False
+        
+        self.mouse_position = (0, 0)
+        # Held-key state keyed by wire id (code*2 + special flag): int
+        # membership tests skip the string hashing a set[str] pays per
+        # keystroke
+        self._pressed_codes = set()
+
+        # Drain-and-batch state: mouse moves coalesce into a single slot
+        # (only the newest matters), discrete events queue up, and a 5ms
+        # flusher ships everything in one datagram instead of one
+        # syscall per pynput callback
+        self._latest_move = None
+        self._pending = collections.deque()
+        # Bound once: saves a self._pending attribute walk per event in
+        # the hot callbacks
+        self._pending_append = self._pending.append
+        self._flush_interval = 0.005
+        self._flush_thread = None
+        self._dropped_sends = 0
+        self._multi_datagram_flushes = 0
+        self._suppressed_repeats = 0
+        
+        # Client display dimensions for scaling
+        self.display_width = 1920
+        self.display_height = 1080
+        self.stream_width = 1280
+        self.stream_height = 720
+        self._num_x, self._den_x = self.stream_width, self.display_width
+        self._num_y, self._den_y = self.stream_height, self.display_height
+
+        self.platform = _PLATFORM
+        self.input_enabled = PYNPUT_AVAILABLE
+        
+        if not self.input_enabled:
+            print("Input forwarding disabled - install pynput to enable")
+    
+    def set_scaling(self, display_width: int, display_height: int, stream_width: int, stream_height: int):
+        """Set scaling for coordinate conversion"""
+        self.display_width = display_width
+        self.display_height = display_height
+        self.stream_width = stream_width
+        self.stream_height = stream_height
+        # Integer numerator/denominator pairs keep the per-event scaling
+        # in pure int arithmetic - no float boxing on the move hot path
+        if display_width > 0 and display_height > 0:
+            self._num_x, self._den_x = stream_width, display_width
+            self._num_y, self._den_y = stream_height, display_height
+        else:
+            self._num_x = self._den_x = self._num_y = self._den_y = 1
+        print(f"Input scaling set: Display {display_width}x{display_height}, Stream {stream_width}x{stream_height}")
+
+    def _scale_coordinates(self, x: int, y: int) -> tuple:
+        """Scale coordinates from display to stream resolution.
+
+        pynput reports float positions on macOS; coerce before the int
+        arithmetic so the results can be struct-packed as int32.
+        """
+        return (int(x) * self._num_x) // self._den_x, (int(y) * self._num_y) // self._den_y
+    
+    def connect(self, host_ip: str):
+        """Connect to host input receiver"""
+        try:
+            self.host_ip = host_ip
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.settimeout(1.0)
+            self._tune_socket()
+            # Fix the destination once so each event goes out via send()
+            # instead of a per-packet sendto address lookup
+            self.socket.connect((host_ip, self.control_port))
+            # Never block the flusher on a full send buffer; a dropped
+            # batch is superseded by the next flush 5ms later
+            self.socket.setblocking(False)
+
+            if self.input_enabled:
+                self._start_input_listeners()
+            else:
+                print("Input forwarding not available")
+            
+            print(f"✅ Input sender connected to {host_ip}")
+            return True
+        except Exception as e:
+            print(f"❌ Input sender connection error: {e}")
+            return False
+    
+    def _tune_socket(self):
+        """Size up the UDP send buffer and mark packets low-delay.
+
+        OS defaults (9KiB on macOS) drop bursty input under GC pauses or
+        scheduler jitter, and dropped key events cannot be replayed.
+        """
+        apply_socket_tuning(self.socket, self.net_config)
+        try:
+            granted = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+            print(f"Input socket send buffer: {granted} bytes")
+        except OSError:
+            pass
+        try:
+            # Input datagrams stay well under the MTU, so set DF (Linux
+            # only) - a fragmented event burst would be all-or-nothing loss
+            self.socket.setsockopt(socket.IPPROTO_IP,
+                                   socket.IP_MTU_DISCOVER, socket.IP_PMTUDISC_DO)
+        except (OSError, AttributeError):
+            pass
+
+    def _start_input_listeners(self):
+        """Start listening for input events"""
+        if not self.input_enabled:
+            return
+            
+        self.running = True
+        
+        self.mouse_listener = mouse.Listener(
+            on_move=self._on_mouse_move,
+            on_click=self._on_mouse_click,
+            on_scroll=self._on_mouse_scroll
+        )
+        
+        self.keyboard_listener = keyboard.Listener(
+            on_press=self._on_key_press,
+            on_release=self._on_key_release
+        )
+        
+        self.mouse_listener.start()
+        self.keyboard_listener.start()
+
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+        print("✅ Input listeners started")
+    
+    def _send_input_event(self, data: bytes):
+        """Send a packed input event to host"""
+        if self.socket and self.host_ip and self.running:
+            try:
+                self.socket.send(data)
+            except BlockingIOError:
+                self._dropped_sends += 1
+            except Exception as e:
+                print(f"Input send error: {e}")
+
+    def _flush_loop(self):
+        """Ship pending input events every few ms in batched datagrams"""
+        while self.running:
+            time.sleep(self._flush_interval)
+            try:
+                self._flush_pending()
+            except Exception as e:
+                print(f"Input flush error: {e}")
+
+    def _flush_pending(self):
+        events = []
+        while self._pending:
+            try:
+                events.append(self._pending.popleft())
+            except IndexError:
+                break
+        move = self._latest_move
+        if move is not None:
+            self._latest_move = None
+            events.append(move)
+        if not events:
+            return
+
+        # Events sit at most one flush interval (5ms) in the queue, so the
+        # whole batch shares a single clock read; packing here also keeps
+        # struct work off the pynput listener thread
+        ts = _now_ns()
+        pack = INPUT_EVENT_STRUCT.pack
+        records = [pack(*evt, ts) for evt in events]
+
+        # Fixed-size records make framing trivial; keep each datagram
+        # under a conservative 1400-byte MTU budget. A flush only splits
+        # into several sends past ~53 events (where Linux sendmmsg would
+        # start to pay off - not exposed by Python's socket module, so
+        # the counter below tracks whether that ever matters in practice)
+        per_datagram = 1400 // INPUT_EVENT_STRUCT.size
+        if len(records) > per_datagram:
+            self._multi_datagram_flushes += 1
+        for i in range(0, len(records), per_datagram):
+            self._send_input_event(b''.join(records[i:i + per_datagram]))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _key_to_wire(key_str: str) -> tuple:
+        """Map a key string to (code, is_special) for the wire format.
+
+        Typing revisits the same few dozen keys, so the memoized table
+        turns repeat lookups into one dict hit.
+        """
+        if len(key_str) == 1:
+            return ord(key_str), 0
+        return SPECIAL_KEY_IDS.get(key_str, 0), 1
+
+    def _on_mouse_move(self, x: int, y: int):
+        """Handle mouse movement"""
+        if not self.running:
+            return
+
+        self.mouse_position = (x, y)
+        scaled_x, scaled_y = self._scale_coordinates(x, y)
+        self._latest_move = (EVENT_MOUSE, MOUSE_MOVE, scaled_x, scaled_y, 0, 0)
+
+    def _on_mouse_click(self, x: int, y: int, button, pressed: bool):
+        """Handle mouse clicks"""
+        if not self.running:
+            return
+
+        button_id = BUTTON_ID_BY_ENUM.get(button, 0)
+        scaled_x, scaled_y = self._scale_coordinates(x, y)
+        self._pending_append((
+            EVENT_MOUSE, MOUSE_PRESS if pressed else MOUSE_RELEASE,
+            scaled_x, scaled_y, button_id, 0))
+
+    def _on_mouse_scroll(self, x: int, y: int, dx: int, dy: int):
+        """Handle mouse scroll"""
+        if not self.running:
+            return
+
+        scaled_x, scaled_y = self._scale_coordinates(x, y)
+        self._pending_append((
+            EVENT_MOUSE, MOUSE_SCROLL, scaled_x, scaled_y, dx, dy))
+
+    def _on_key_press(self, key):
+        """Handle key press"""
+        if not self.running:
+            return
+
+        try:
+            key_str = self._key_to_string(key)
+            code, special = self._key_to_wire(key_str)
+            wire_id = code * 2 + special
+            # OS auto-repeat re-fires press for a held key without a
+            # release in between; the host already holds the key down,
+            # so forwarding repeats is pure redundant traffic
+            if wire_id in self._pressed_codes:
+                self._suppressed_repeats += 1
+                return
+            self._pressed_codes.add(wire_id)
+            self._pending_append((EVENT_KEYBOARD, KEY_PRESS, code, special, 0, 0))
+
+        except Exception as e:
+            print(f"Key press error: {e}")
+
+    def _on_key_release(self, key):
+        """Handle key release"""
+        if not self.running:
+            return
+
+        try:
+            key_str = self._key_to_string(key)
+            code, special = self._key_to_wire(key_str)
+            self._pressed_codes.discard(code * 2 + special)
+            self._pending_append((EVENT_KEYBOARD, KEY_RELEASE, code, special, 0, 0))
+
+        except Exception as e:
+            print(f"Key release error: {e}")
+    
+    def _key_to_string(self, key) -> str:
+        """Convert key to string representation"""
+        if hasattr(key, 'char') and key.char is not None:
+            return key.char
+        return KEY_NAME_BY_ENUM.get(key) or str(key).rsplit('.', 1)[-1]
+    
+    def disconnect(self):
+        """Disconnect input sender"""
+        try:
+            self._flush_pending()
+        except Exception:
+            pass
+        self.running = False
+
+        if self.mouse_listener:
+            self.mouse_listener.stop()
+        if self.keyboard_listener:
+            self.keyboard_listener.stop()
+        if self.socket:
+            self.socket.close()
+
+# ========== VIDEO DISPLAY ==========
+class VideoDisplay:
+    def __init__(self, parent, width=1280, height=720):
+        self.parent = parent
+        self.width = width
+        self.height = height
+        self.current_image = None
+
+        # Persistent Tk image updated in place via paste() - recreating a
+        # PhotoImage per frame allocates/frees a Tk resource at video rate
+        self._photo = None
+        self._photo_size = None
+
+        # Pooled conversion scratch: cv2 writes into _rgb_scratch and
+        # _pil_img is a persistent zero-copy window over it, so steady-state
+        # frames allocate nothing on the GUI thread
+        self._rgb_scratch = None
+        self._pil_img = None
+
+        # GPU resize path when OpenCV was built with CUDA: the full frame
+        # is resized on the device and only the small thumbnail comes back
+        self._use_cuda = False
+        if CV2_AVAILABLE:
+            try:
+                self._use_cuda = cv2.cuda.getCudaEnabledDeviceCount() > 0
+            except Exception:
+                self._use_cuda = False
+        if self._use_cuda:
+            self._gpu_frame = cv2.cuda_GpuMat()
+            print("✅ Using CUDA for display resize")
+
+        # Optional HighGUI output: EDGELITE_CV2_DISPLAY=1 renders frames
+        # through OpenCV's own window, whose blit path (GPU-backed on
+        # most builds) bypasses the Tk PhotoImage/Tcl copy entirely.
+        # The Tk window stays up for controls and stats.
+        self._use_cv2_window = (
+            CV2_AVAILABLE and os.environ.get('EDGELITE_CV2_DISPLAY') == '1')
+        self._cv2_window_open = False
+
+        self.setup_display()
+    
+    def setup_display(self):
+        """Setup Tkinter video display using grid"""
+        self.frame = ttk.Frame(self.parent)
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.video_label = ttk.Label(
+            self.frame, 
+            text="Enter host IP and click Connect",
+            background='black',
+            foreground='white',
+            font=('Arial', 12),
+            anchor='center',
+            justify='center'
+        )
+        self.video_label.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
+    
+    def update_frame(self, frame, stats):
+        """Update the video display with new frame"""
+        if frame is None or not CV2_AVAILABLE:
+            return
+
+        if self._use_cv2_window:
+            self._update_cv2_window(frame)
+            return
+        self._update_tkinter_frame(frame, stats)
+
+    def _update_cv2_window(self, frame):
+        """Render through OpenCV HighGUI instead of Tk.
+
+        imshow hands the pixels straight to the window system and the
+        window scales them itself, so the per-frame resize, PIL wrap
+        and PhotoImage paste all disappear. Falls back to the Tk path
+        if HighGUI isn't functional (headless OpenCV builds).
+        """
+        try:
+            if not self._cv2_window_open:
+                cv2.namedWindow('EdgeLite Stream', cv2.WINDOW_NORMAL)
+                cv2.resizeWindow('EdgeLite Stream', self.width, self.height)
+                self._cv2_window_open = True
+                self.video_label.configure(
+                    text="Streaming in OpenCV window", image='')
+            if frame.shape[2] == 4:
+                # imshow wants BGRA; stream frames arrive RGBA
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGRA)
+            cv2.imshow('EdgeLite Stream', frame)
+            cv2.waitKey(1)
+        except Exception as e:
+            print(f"OpenCV display failed, using Tk: {e}")
+            self._use_cv2_window = False
+            self._cv2_window_open = False
+    
+    def _update_tkinter_frame(self, frame, stats):
+        """Update Tkinter display with new frame"""
+        try:
+            display_width = self.video_label.winfo_width()
+            display_height = self.video_label.winfo_height()
+
+            if display_width <= 1 or display_height <= 1:
+                display_width = self.width
+                display_height = self.height
+
+            # Resize with OpenCV (SIMD INTER_AREA, much faster than PIL
+            # LANCZOS on downscale), then color-convert straight into the
+            # pooled scratch buffer the persistent PIL image wraps
+            h, w = frame.shape[:2]
+            scale = min(display_width / w, display_height / h, 1.0)
+            new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            if scale >= 1.0:
+                # Frame already fits the display - nothing to resize
+                resized = frame
+            elif self._use_cuda:
+                try:
+                    self._gpu_frame.upload(frame)
+                    resized = cv2.cuda.resize(
+                        self._gpu_frame, new_size,
+                        interpolation=cv2.INTER_AREA).download()
+                except Exception as e:
+                    print(f"CUDA resize failed, using CPU: {e}")
+                    self._use_cuda = False
+                    resized = cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+            else:
+                resized = cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+
+            nw, nh = new_size
+            if self._rgb_scratch is None or self._rgb_scratch.shape[:2] != (nh, nw):
+                self._rgb_scratch = np.empty((nh, nw, 4), np.uint8)
+                # RGBA is one of the modes frombuffer shares memory for
+                # (RGB would silently copy), so this image object stays
+                # valid across frames as the scratch gets rewritten
+                self._pil_img = Image.frombuffer(
+                    'RGBA', new_size, self._rgb_scratch, 'raw', 'RGBA', 0, 1)
+            if resized.shape[2] == 4:
+                # Stream frames arrive RGBA already - plain copy into
+                # the scratch the PIL image wraps
+                np.copyto(self._rgb_scratch, resized)
+            else:
+                # 3-channel (BGR) frames, e.g. the locally drawn error
+                # card, still get converted here
+                cv2.cvtColor(resized, cv2.COLOR_BGR2RGBA, dst=self._rgb_scratch)
+            img = self._pil_img
+
+            if self._photo is None or self._photo_size != img.size:
+                self._photo = ImageTk.PhotoImage(image=img)
+                self._photo_size = img.size
+                self.video_label.configure(image=self._photo, text="")
+            else:
+                self._photo.paste(img)
+
+        except Exception as e:
+            print(f"Frame update error: {e}")
+    
+    def _close_cv2_window(self):
+        if self._cv2_window_open:
+            try:
+                cv2.destroyWindow('EdgeLite Stream')
+            except Exception:
+                pass
+            self._cv2_window_open = False
+
+    def show_connecting(self):
+        """Show connecting state"""
+        self._close_cv2_window()
+        self._photo = None
+        self._photo_size = None
+        self.video_label.configure(
+            image='',
+            text="Connecting to host...\n\nStarting FFmpeg receiver...",
+            background='black',
+            foreground='white'
+        )
+    
+    def show_error(self, message):
+        """Show error message"""
+        self._close_cv2_window()
+        self._photo = None
+        self._photo_size = None
+        self.video_label.configure(
+            image='',
+            text=f"Error: {message}\n\nCheck host connection and try again",
+            background='darkred',
+            foreground='white'
+        )
+
+# ========== MAIN CLIENT GUI ==========
+class EdgeLiteClient:
+    def __init__(self):
+        self.config_manager = ConfigManager()
+        
+        # Check if FFmpeg is available
+        self.ffmpeg_available = self._check_ffmpeg()
+        
+        # Select receiver based on FFmpeg availability
+        if self.ffmpeg_available:
+            self.receiver = FFmpegVideoReceiver(self.config_manager)
+            print("🔧 Using FFmpeg H.264 video receiver")
+        else:
+            from SimpleVideoReceiver import SimpleVideoReceiver
+            self.receiver = SimpleVideoReceiver(self.config_manager)
+            print("🔧 Using simple video receiver (FFmpeg not available)")
+            
+        self.input_sender = CrossPlatformInputSender(
+            self.config_manager.network_config.control_port,
+            net_config=self.config_manager.network_config)
+        
+        self.connected = False
+        self.connection_start_time = 0
+        self.host_ip = None
+        self.is_fullscreen = False
+
+        # Latest-frame slot for GUI updates: at most one Tk event pending,
+        # so decoded frames can never pile up in the Tk event queue
+        self._pending_frame = None
+        self._pending_scheduled = False
+        self._pending_lock = threading.Lock()
+        # Renders are additionally paced to ~60Hz: decoding faster than
+        # the display refreshes just burns the Tk thread on invisible
+        # resize+paste work
+        self._last_render = 0.0
+
+        # Log lines buffer up and hit the Text widget in one insert per
+        # flush tick instead of one Tk call per line
+        self._log_buf = []
+        self._log_flush_scheduled = False
+        
+        self.root = None
+        self.log_text = None
+        self.connect_btn = None
+        self.connection_status = None
+        self.video_display = None
+        self.notebook = None
+        self.video_tab = None
+        self.controls_tab = None
+        
+        self.setup_gui()
+        self.receiver.set_frame_callback(self.on_new_frame)
+    
+    def _check_ffmpeg(self):
+        """Check if FFmpeg is available on the system"""
+        try:
+            result = subprocess.run(['ffmpeg', '-version'], 
+                                  capture_output=True, 
+                                  text=True, 
+                                  timeout=5)
+            if result.returncode == 0:
+                print("✅ FFmpeg is available")
+                return True
+            else:
+                print("❌ FFmpeg check failed")
+                return False
+        except:
+            print("❌ FFmpeg not found in system PATH")
+            return False
+    
+    def setup_gui(self):
+        """Setup the main client GUI with tabs"""
+        self.root = tk.Tk()
+        self.root.title("EdgeLite Client - FFmpeg H.264")
+        self.root.geometry("1024x768")
+        
+        # Bind F11 for fullscreen toggle
+        self.root.bind('<F11>', self.toggle_fullscreen)
+        self.root.bind('<Escape>', self.exit_fullscreen)
+        
+        # Create notebook (tabbed interface)
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Video Tab
+        self.video_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.video_tab, text='Video')
+        
+        # Controls Tab
+        self.controls_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.controls_tab, text='Controls')
+        
+        # Setup video display in video tab
+        self.setup_video_tab()
+        
+        # Setup controls in controls tab
+        self.setup_controls_tab()
+        
+        self.setup_platform_input()
+        
+        self.log("✅ EdgeLite FFmpeg H.264 Client Started")
+        self.log(f"🌍 Platform: {platform.system()} {platform.release()}")
+        
+        if self.ffmpeg_available:
+            self.log("🔧 Using FFmpeg H.264 decoder with UDP")
+        else:
+            self.log("⚠️ Using simple receiver - FFmpeg not available")
+            self.log("💡 Install FFmpeg for better video performance:")
+            self.log("   Windows: download from ffmpeg.org")
+            self.log("   macOS: brew install ffmpeg")
+            self.log("   Linux: sudo apt install ffmpeg")
+        
+        self.log("💡 Enter host IP and click Connect")
+        self.log("💡 For testing, use 127.0.0.1 to connect to yourself")
+        self.log("💡 Press F11 to toggle fullscreen, ESC to exit fullscreen")
+        
+        if not CV2_AVAILABLE:
+            self.log("❌ WARNING: OpenCV/PIL not installed - video display disabled")
+            self.log("   Install with: pip install opencv-python Pillow")
+        if not PYNPUT_AVAILABLE:
+            self.log("❌ WARNING: pynput not installed - input forwarding disabled")
+            self.log("   Install with: pip install pynput")
+    
+    def setup_video_tab(self):
+        """Setup the video tab with display and status"""
+        # Video display
+        self.video_display = VideoDisplay(self.video_tab)
+        
+        # Status frame at bottom of video tab
+        status_frame = ttk.Frame(self.video_tab)
+        status_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        self.fps_label = ttk.Label(status_frame, text="FPS: 0")
+        self.fps_label.pack(side=tk.LEFT, padx=5)
+        
+        self.connection_label = ttk.Label(status_frame, text="FFmpeg Receiver")
+        self.connection_label.pack(side=tk.LEFT, padx=5)
+        
+        platform_info = f"{platform.system()} {platform.release()}"
+        self.platform_label = ttk.Label(status_frame, text=platform_info)
+        self.platform_label.pack(side=tk.RIGHT, padx=5)
+        
+        # Fullscreen hint
+        fullscreen_label = ttk.Label(status_frame, text="F11: Fullscreen | ESC: Exit Fullscreen")
+        fullscreen_label.pack(side=tk.RIGHT, padx=5)
+    
+    def setup_controls_tab(self):
+        """Setup the controls tab with connection controls and log"""
+        # Connection controls
+        control_frame = ttk.LabelFrame(self.controls_tab, text="Connection", padding="10")
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        ttk.Label(control_frame, text="Host IP:").grid(row=0, column=0, sticky="w", padx=(0, 5))
+        self.host_ip_var = tk.StringVar(value="127.0.0.1")
+        ip_entry = ttk.Entry(control_frame, textvariable=self.host_ip_var, width=15)
+        ip_entry.grid(row=0, column=1, sticky="ew", padx=(0, 5))
+        
+        self.connect_btn = ttk.Button(control_frame, text="Connect", command=self.toggle_connection)
+        self.connect_btn.grid(row=0, column=2, padx=(0, 5))
+        
+        self.connection_status = ttk.Label(control_frame, text="🔴 DISCONNECTED", foreground="red", font=('Arial', 9, 'bold'))
+        self.connection_status.grid(row=0, column=3, padx=(10, 0))
+        
+        control_frame.columnconfigure(1, weight=1)
+        
+        # Settings frame
+        settings_frame = ttk.LabelFrame(self.controls_tab, text="Settings", padding="10")
+        settings_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        # Input control checkbox
+        self.input_enabled_var = tk.BooleanVar(value=True)
+        input_checkbox = ttk.Checkbutton(
+            settings_frame, 
+            text="Enable Input Control", 
+            variable=self.input_enabled_var,
+            command=self.toggle_input_control
+        )
+        input_checkbox.pack(anchor=tk.W)
+        
+        input_info = ttk.Label(
+            settings_frame, 
+            text="When enabled: Click the video display to control host computer",
+            foreground="gray",
+            font=('Arial', 8)
+        )
+        input_info.pack(anchor=tk.W, pady=(0, 5))
+        
+        # Log frame
+        log_frame = ttk.LabelFrame(self.controls_tab, text="Connection Log", padding="5")
+        log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.log_text = tk.Text(log_frame, height=10)
+        self.log_text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+        
+        log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
+        log_scrollbar.pack(fill=tk.Y, side=tk.RIGHT)
+        self.log_text.configure(yscrollcommand=log_scrollbar.set)
+    
+    def setup_platform_input(self):
+        """Setup input forwarding with proper focus handling"""
+        if hasattr(self.video_display, 'video_label'):
+            # Bind focus events to video display
+            self.video_display.video_label.bind('<Enter>', self.on_video_focus)
+            self.video_display.video_label.bind('<Leave>', self.on_video_blur)
+            self.video_display.video_label.bind('<Button-1>', self.on_video_click)
+            
+            # Make video label focusable
+            self.video_display.video_label.focus_set()
+    
+    def toggle_input_control(self):
+        """Toggle input control on/off"""
+        if self.input_enabled_var.get():
+            self.log("✅ Input control enabled")
+            if self.connected:
+                self.input_sender.connect(self.host_ip)
+        else:
+            self.log("❌ Input control disabled")
+            self.input_sender.disconnect()
+    
+    def on_video_click(self, event):
+        """When video display is clicked, focus it"""
+        self.video_display.video_label.focus_set()
+        if self.input_enabled_var.get():
+            self.log("🎯 Video display focused - input forwarding active")
+        
+    def on_video_focus(self, event):
+        """When video display gets focus"""
+        if self.connected and self.input_enabled_var.get():
+            self.log("🎯 Video display focused - input forwarding active")
+            self.log("🖱️  You can now control the host computer")
+            self.log("💡 Click anywhere outside the video to release control")
+    
+    def on_video_blur(self, event):
+        """When video display loses focus"""
+        if self.connected and self.input_enabled_var.get():
+            self.log("🎯 Video display unfocused - input forwarding inactive")
+    
+    def toggle_fullscreen(self, event=None):
+        """Toggle fullscreen mode"""
+        self.is_fullscreen = not self.is_fullscreen
+        self.root.attributes('-fullscreen', self.is_fullscreen)
+        
+        if self.is_fullscreen:
+            # Hide the notebook and show only video
+            self.notebook.pack_forget()
+            self.video_tab.pack(fill=tk.BOTH, expand=True)
+            self.log("📺 Entered fullscreen mode (Press ESC to exit)")
+        else:
+            # Show the notebook again
+            self.video_tab.pack_forget()
+            self.notebook.pack(fill=tk.BOTH, expand=True)
+            self.log("📺 Exited fullscreen mode")
+    
+    def exit_fullscreen(self, event=None):
+        """Exit fullscreen mode"""
+        if self.is_fullscreen:
+            self.toggle_fullscreen()
+    
+    def on_new_frame(self, frame):
+        """Callback for new video frames"""
+        if not hasattr(self, 'video_display'):
+            return
+        stats = self.receiver.get_stats()
+        with self._pending_lock:
+            self._pending_frame = (frame, stats)
+            if not self._pending_scheduled:
+                self._pending_scheduled = True
+                # Hold the drain back until ~16ms since the last render
+                # have passed; the slot keeps overwriting itself in the
+                # meantime so the drain still shows the newest frame
+                delay_ms = int((0.016 - (time.monotonic() - self._last_render)) * 1000)
+                self.root.after(max(0, delay_ms), self._drain_pending_frame)
+
+    def _drain_pending_frame(self):
+        """Display the newest pending frame (runs on the Tk thread)"""
+        with self._pending_lock:
+            pending = self._pending_frame
+            self._pending_frame = None
+            self._pending_scheduled = False
+        if pending is not None:
+            self._last_render = time.monotonic()
+            self.update_display(*pending)
+    
+    def update_display(self, frame, stats):
+        """Update video display and stats in main thread"""
+        if self.video_display:
+            self.video_display.update_frame(frame, stats)
+        
+        # Update status labels
+        self.fps_label.config(text=f"FPS: {stats.get('fps', 0)}")
+        
+        if self.connected and stats['connected']:
+            connection_time = time.time() - self.connection_start_time
+            status_text = f"🟢 CONNECTED ({int(connection_time)}s)"
+            self.connection_status.config(text=status_text, foreground="green")
+            self.connection_label.config(text="🟢 Streaming", foreground="green")
+        else:
+            if self.connected and not stats['connected']:
+                self.connected = False
+                self.connect_btn.config(text="Connect")
+                self.connection_status.config(text="🔴 CONNECTION LOST", foreground="red")
+                self.connection_label.config(text="🔴 Disconnected", foreground="red")
+                self.log("❌ Connection lost - video stream disconnected")
+                self.video_display.show_error("Connection lost")
+    
+    def toggle_connection(self):
+        """Connect or disconnect from host"""
+        if not self.connected:
+            self.connect_to_host()
+        else:
+            self.disconnect_from_host()
+    
+    def connect_to_host(self):
+        """Connect to selected host"""
+        host_ip = self.host_ip_var.get().strip()
+        if not host_ip:
+            messagebox.showerror("Error", "Please enter host IP address")
+            return
+        
+        if not CV2_AVAILABLE:
+            messagebox.showerror("Error",
+                "OpenCV/PIL not installed!\n\n"
+                "Video display requires OpenCV and PIL.\n"
+                "Install with: pip install opencv-python Pillow")
+            return
+        
+        self.log(f"🔗 Connecting to {host_ip}...")
+        self.video_display.show_connecting()
+        
+        self.connection_status.config(text="🟡 CONNECTING...", foreground="orange")
+        self.connect_btn.config(state="disabled")
+        
+        def connect_thread():
+            success = self.receiver.connect(host_ip)
+            self.root.after(0, self._connection_result, success, host_ip)
+        
+        threading.Thread(target=connect_thread, daemon=True).start()
+    
+    def _connection_result(self, success, host_ip):
+        self.connect_btn.config(state="normal")
+        
+        if success:
+            self.connected = True
+            self.connection_start_time = time.time()
+            self.host_ip = host_ip
+            
+            self.connect_btn.config(text="Disconnect")
+            self.connection_status.config(text="🟢 CONNECTED", foreground="green")
+            
+            # Setup input scaling with proper dimensions
+            display_width = self.video_display.video_label.winfo_width()
+            display_height = self.video_display.video_label.winfo_height()
+            
+            # If video label dimensions are not available yet, use default
+            if display_width <= 1 or display_height <= 1:
+                display_width = 1280
+                display_height = 720
+            
+            stream_config = self.config_manager.stream_config
+            self.input_sender.set_scaling(
+                display_width, display_height,
+                stream_config.width,
+                stream_config.height
+            )
+            
+            # Start input sender if enabled
+            if self.input_enabled_var.get():
+                input_success = self.input_sender.connect(host_ip)
+                if input_success:
+                    self.log("✅ Input control initialized")
+                else:
+                    self.log("⚠️ Input control failed to start")
+            
+            self.log(f"✅ Successfully connected to {host_ip}")
+            if self.ffmpeg_available:
+                self.log("🔧 Using FFmpeg H.264 decoder")
+            else:
+                self.log("🔧 Using simple UDP receiver")
+            
+            if self.input_enabled_var.get():
+                self.log("🎯 Click the video display to start controlling the host")
+            self.log("📺 Waiting for video stream...")
+            
+        else:
+            self.connection_status.config(text="🔴 CONNECTION FAILED", foreground="red")
+            self.video_display.show_error(f"Cannot connect to {host_ip}")
+            self.log(f"❌ Failed to connect to {host_ip}")
+            
+            error_msg = f"Failed to connect to {host_ip}\n\nPossible issues:\n"
+            error_msg += "• Host IP address is incorrect\n"
+            error_msg += "• Host is not running EdgeLite\n"
+            error_msg += "• Host firewall is blocking connection\n"
+            error_msg += "• Make sure host has started streaming\n"
+            
+            if not self.ffmpeg_available:
+                error_msg += "• FFmpeg is not installed on client\n"
+            
+            messagebox.showerror("Connection Failed", error_msg)
+    
+    def disconnect_from_host(self):
+        """Disconnect from host"""
+        self.log("🔌 Disconnecting from host...")
+        
+        self.receiver.disconnect()
+        self.input_sender.disconnect()
+        
+        self.connected = False
+        self.connect_btn.config(text="Connect")
+        self.connection_status.config(text="🔴 DISCONNECTED", foreground="red")
+        self.connection_label.config(text="🔴 Disconnected", foreground="red")
+        
+        if self.video_display:
+            self.video_display.video_label.configure(
+                image='',
+                text="Disconnected\n\n" +
+                     "Enter host IP and click Connect to reconnect",
+                background='black',
+                foreground='white'
+            )
+        
+        self.log("✅ Disconnected from host")
+        self.log("💡 Ready for new connection")
+    
+    def log(self, message: str):
+        """Add message to log"""
+        try:
+            timestamp = time.strftime('%H:%M:%S')
+            if self.log_text:
+                self._log_buf.append(f"[{timestamp}] {message}\n")
+                if not self._log_flush_scheduled:
+                    self._log_flush_scheduled = True
+                    self.root.after(200, self._flush_log)
+            else:
+                print(f"[{timestamp}] {message}")
+        except Exception as e:
+            print(f"Log error: {e}")
+            print(f"Message: {message}")
+
+    def _flush_log(self):
+        """Insert all buffered log lines in one Tk call"""
+        self._log_flush_scheduled = False
+        if not self._log_buf:
+            return
+        lines, self._log_buf = self._log_buf, []
+        try:
+            self.log_text.insert(tk.END, "".join(lines))
+            self.log_text.see(tk.END)
+        except Exception as e:
+            print(f"Log flush error: {e}")
+    
+    def run(self):
+        """Start the client application"""
+        try:
+            self.update_stats()
+            self.root.mainloop()
+        except KeyboardInterrupt:
+            self.cleanup()
+        finally:
+            self.cleanup()
+    
+    def update_stats(self):
+        """Periodically update statistics"""
+        try:
+            minimized = self.root.state() == 'iconic'
+        except Exception:
+            minimized = False
+        if self.connected and not minimized:
+            stats = self.receiver.get_stats()
+            self.update_display(None, stats)
+            
+            if not stats['connected']:
+                self.connected = False
+                self.connect_btn.config(text="Connect")
+                self.connection_status.config(text="🔴 CONNECTION LOST", foreground="red")
+                self.connection_label.config(text="🔴 Disconnected", foreground="red")
+                self.log("❌ Connection lost with host")
+        
+        self.root.after(1000, self.update_stats)
+    
+    def cleanup(self):
+        """Cleanup resources"""
+        self.connected = False
+        self.receiver.disconnect()
+        self.input_sender.disconnect()
+
+# ========== MAIN ENTRY POINT ==========
+def main():
+    """Main entry point"""
+    print(f"🌍 Platform: {platform.system()} {platform.release()}")
+    print(f"🐍 Python: {platform.python_version()}")
+    print("🚀 Starting EdgeLite FFmpeg H.264 Client")
+    
+    if not CV2_AVAILABLE:
+        print("❌ CRITICAL: OpenCV and PIL are required for video display")
+        response = input("   Install now? (y/n): ")
+        if response.lower() == 'y':
+            os.system("pip install opencv-python Pillow")
+            print("✅ Please restart the application")
+            return
+    
+    try:
+        app = EdgeLiteClient()
+        app.run()
+    except Exception as e:
+        print(f"💥 Fatal error: {e}")
+        import traceback
+        traceback.print_exc()
+        input("Press Enter to exit...")
+
+if __name__ == "__main__":
+    main()
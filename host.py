@@ -1,632 +1,2169 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
-import time
-import queue
-import json
-import os
-import platform
-import socket
-import mss
-import numpy as np
-import av
-import logging
-logging.basicConfig(level=logging.DEBUG)
-# ========== CONFIGURATION ==========
-class StreamConfig:
-    def __init__(self):
-        self.width = 1280
-        self.height = 720
-        self.fps = 60
-        self.bitrate = "2M"
-        self.encoder = "auto"
-
-class NetworkConfig:
-    def __init__(self):
-        self.video_port = 5555
-        self.control_port = 5556
-        self.discovery_port = 5557
-        self.buffer_size = 65536
-
-class ConfigManager:
-    def __init__(self):
-        self.stream_config = StreamConfig()
-        self.network_config = NetworkConfig()
-
-# ========== CAPTURE ==========
-class HighPerformanceCapture:
-    def __init__(self, target_fps=60):
-        self.target_fps = target_fps
-        self.running = False
-        self.frame_queue = queue.Queue(maxsize=2)
-        self.thread = None
-        self.frame_count = 0
-        
-    def start_capture(self, on_frame_callback=None):
-        self.running = True
-        self.thread = threading.Thread(target=self._capture_loop, args=(on_frame_callback,), daemon=True)
-        self.thread.start()
-    
-    def _capture_loop(self, on_frame_callback=None):
-        with mss.mss() as sct:
-            monitor = sct.monitors[1]
-            target_frame_time = 1.0 / self.target_fps
-            
-            while self.running:
-                frame_start = time.perf_counter()
-                
-                try:
-                    screenshot = sct.grab(monitor)
-                    frame = np.array(screenshot)
-                    
-                    self.frame_count += 1
-                    
-                    if on_frame_callback:
-                        on_frame_callback(frame)
-                    
-                    if not self.frame_queue.full():
-                        try:
-                            self.frame_queue.put_nowait(frame)
-                        except queue.Full:
-                            pass
-                    
-                    elapsed = time.perf_counter() - frame_start
-                    sleep_time = target_frame_time - elapsed
-                    
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
-                        
-                except Exception as e:
-                    print(f"Capture error: {e}")
-                    time.sleep(0.001)
-    
-    def stop_capture(self):
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=1.0)
-
-# ========== ENCODER ==========
-class HardwareEncoder:
-    def __init__(self, width, height, fps=60, bitrate="2M"):
-        self.width = width
-        self.height = height
-        self.fps = fps
-        self.bitrate = bitrate
-        self.running = False
-        
-        self.frame_queue = queue.Queue(maxsize=3)
-        self.packet_queue = queue.Queue(maxsize=10)
-        
-        self.encoder_name = self._select_hardware_encoder()
-        self.codec_context = None
-        
-        print(f"Using encoder: {self.encoder_name}")
-    
-    def _select_hardware_encoder(self):
-        system = platform.system().lower()
-        if system == "windows":
-            return "h264_nvenc"
-        elif system == "darwin":
-            return "h264_videotoolbox"
-        else:
-            return "libx264"
-    
-    def _setup_codec(self):
-        try:
-            self.codec_context = av.CodecContext.create(self.encoder_name, 'w')
-            self.codec_context.width = self.width
-            self.codec_context.height = self.height
-            self.codec_context.framerate = self.fps
-            self.codec_context.pix_fmt = 'yuv420p'
-            
-            if 'M' in self.bitrate:
-                bitrate_int = int(float(self.bitrate.replace('M', '')) * 1000000)
-            else:
-                bitrate_int = int(self.bitrate)
-            
-            self.codec_context.bit_rate = bitrate_int
-            
-            if self.encoder_name in ['h264_nvenc']:
-                self.codec_context.options = {
-                    'preset': 'p1',
-                    'tune': 'ull',
-                    'rc': 'cbr',
-                }
-            
-            self.codec_context.open()
-            
-        except Exception as e:
-            print(f"Encoder setup failed: {e}")
-            raise
-    
-    def start_encoding(self):
-        self._setup_codec()
-        self.running = True
-        self.encode_thread = threading.Thread(target=self._encode_loop, daemon=True)
-        self.encode_thread.start()
-    
-    def _encode_loop(self):
-        while self.running:
-            try:
-                frame = self.frame_queue.get(timeout=0.001)
-                if frame is None:
-                    continue
-                
-                av_frame = av.VideoFrame.from_ndarray(frame, format='rgb24')
-                av_frame = av_frame.reformat(width=self.width, height=self.height)
-                
-                packets = self.codec_context.encode(av_frame)
-                
-                for packet in packets:
-                    if packet:
-                        if not self.packet_queue.full():
-                            self.packet_queue.put_nowait(packet)
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Encoding error: {e}")
-                time.sleep(0.001)
-    
-    def add_frame(self, frame):
-        if self.running and not self.frame_queue.full():
-            try:
-                self.frame_queue.put_nowait(frame)
-            except queue.Full:
-                pass
-    
-    def get_packet(self):
-        try:
-            return self.packet_queue.get_nowait()
-        except queue.Empty:
-            return None
-    
-    def stop_encoding(self):
-        self.running = False
-        # Don't call close() on codec_context - it doesn't exist
-        # The context will be garbage collected automatically
-        self.codec_context = None
-
-# ========== NETWORK ==========
-class Streamer:
-    def __init__(self, video_port=5555, control_port=5556):
-        self.video_port = video_port
-        self.control_port = control_port
-        self.running = False
-        self.video_socket = None
-        self.client_address = None
-        self.packet_queue = queue.Queue(maxsize=20)
-        self.sent_packets = 0
-    
-    def start_streaming(self, client_ip):
-        try:
-            self.client_address = (client_ip, self.video_port)
-            self.video_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.video_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536 * 4)
-            
-            self.running = True
-            self.stream_thread = threading.Thread(target=self._streaming_loop, daemon=True)
-            self.stream_thread.start()
-            
-            return True
-            
-        except Exception as e:
-            print(f"Stream start error: {e}")
-            return False
-    
-    def _streaming_loop(self):
-        while self.running:
-            try:
-                packet = self.packet_queue.get(timeout=0.001)
-                if packet is None:
-                    continue
-                
-                packet_data = packet.to_bytes()
-                self.video_socket.sendto(packet_data, self.client_address)
-                self.sent_packets += 1
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Streaming error: {e}")
-                time.sleep(0.001)
-    
-    def send_packet(self, packet):
-        if self.running and not self.packet_queue.full():
-            try:
-                self.packet_queue.put_nowait(packet)
-            except queue.Full:
-                pass
-    
-    def stop_streaming(self):
-        self.running = False
-        if self.video_socket:
-            self.video_socket.close()
-
-# ========== INPUT ==========
-try:
-    from pynput import mouse, keyboard
-    import pyautogui
-    INPUT_AVAILABLE = True
-except ImportError:
-    INPUT_AVAILABLE = False
-    print("Input libraries not available - input forwarding disabled")
-
-class InputForwarder:
-    def __init__(self, control_port=5556):
-        self.control_port = control_port
-        self.running = False
-        self.socket = None
-        self.client_address = None
-        self.mouse_listener = None
-        self.keyboard_listener = None
-        
-    def connect(self, client_ip):
-        try:
-            self.client_address = (client_ip, self.control_port)
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            
-            if INPUT_AVAILABLE:
-                self._start_input_listeners()
-            
-            return True
-        except Exception as e:
-            print(f"Input forwarder connection error: {e}")
-            return False
-    
-    def _start_input_listeners(self):
-        self.running = True
-        
-        self.mouse_listener = mouse.Listener(
-            on_move=self._on_mouse_move,
-            on_click=self._on_mouse_click,
-            on_scroll=self._on_mouse_scroll
-        )
-        
-        self.keyboard_listener = keyboard.Listener(
-            on_press=self._on_key_press,
-            on_release=self._on_key_release
-        )
-        
-        self.mouse_listener.start()
-        self.keyboard_listener.start()
-    
-    def _send_input_event(self, event_data):
-        if self.socket and self.client_address:
-            try:
-                data = json.dumps(event_data).encode('utf-8')
-                self.socket.sendto(data, self.client_address)
-            except Exception as e:
-                print(f"Input send error: {e}")
-    
-    def _on_mouse_move(self, x, y):
-        event = {
-            'type': 'mouse',
-            'action': 'move',
-            'x': x,
-            'y': y,
-            'timestamp': time.time()
-        }
-        self._send_input_event(event)
-    
-    def _on_mouse_click(self, x, y, button, pressed):
-        button_name = str(button).replace('Button.', '')
-        
-        event = {
-            'type': 'mouse',
-            'action': 'press' if pressed else 'release',
-            'button': button_name,
-            'x': x,
-            'y': y,
-            'timestamp': time.time()
-        }
-        self._send_input_event(event)
-        
-        if INPUT_AVAILABLE:
-            try:
-                if pressed:
-                    pyautogui.mouseDown(x, y, button=button_name)
-                else:
-                    pyautogui.mouseUp(x, y, button=button_name)
-            except Exception as e:
-                print(f"Mouse simulation error: {e}")
-    
-    def _on_mouse_scroll(self, x, y, dx, dy):
-        event = {
-            'type': 'mouse',
-            'action': 'scroll',
-            'x': x,
-            'y': y,
-            'dx': dx,
-            'dy': dy,
-            'timestamp': time.time()
-        }
-        self._send_input_event(event)
-        
-        if INPUT_AVAILABLE:
-            try:
-                pyautogui.scroll(dy)
-            except Exception as e:
-                print(f"Scroll simulation error: {e}")
-    
-    def _on_key_press(self, key):
-        try:
-            key_str = self._key_to_string(key)
-            
-            event = {
-                'type': 'keyboard',
-                'action': 'press',
-                'key': key_str,
-                'timestamp': time.time()
-            }
-            self._send_input_event(event)
-            
-            if INPUT_AVAILABLE:
-                try:
-                    pyautogui.keyDown(key_str)
-                except Exception as e:
-                    print(f"Key press simulation error: {e}")
-            
-        except Exception as e:
-            print(f"Key press error: {e}")
-    
-    def _on_key_release(self, key):
-        try:
-            key_str = self._key_to_string(key)
-            
-            event = {
-                'type': 'keyboard',
-                'action': 'release',
-                'key': key_str,
-                'timestamp': time.time()
-            }
-            self._send_input_event(event)
-            
-            if INPUT_AVAILABLE:
-                try:
-                    pyautogui.keyUp(key_str)
-                except Exception as e:
-                    print(f"Key release simulation error: {e}")
-            
-        except Exception as e:
-            print(f"Key release error: {e}")
-    
-    def _key_to_string(self, key):
-        if hasattr(key, 'char') and key.char is not None:
-            return key.char
-        else:
-            return str(key).replace('Key.', '')
-    
-    def disconnect(self):
-        self.running = False
-        
-        if self.mouse_listener:
-            self.mouse_listener.stop()
-        if self.keyboard_listener:
-            self.keyboard_listener.stop()
-        if self.socket:
-            self.socket.close()
-
-# ========== MAIN HOST GUI ==========
-class EdgeLiteHost:
-    def __init__(self):
-        self.config_manager = ConfigManager()
-        self.capture = None
-        self.encoder = None
-        self.streamer = None
-        self.input_forwarder = None
-        
-        self.streaming = False
-        self.client_ip = None
-        
-        self.setup_gui()
-    
-    def setup_gui(self):
-        self.root = tk.Tk()
-        self.root.title("EdgeLite Host")
-        self.root.geometry("500x400")
-        
-        # Main container
-        main_frame = ttk.Frame(self.root, padding="15")
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Title
-        title_label = ttk.Label(main_frame, text="🎮 EdgeLite Streaming Host", font=('Arial', 16, 'bold'))
-        title_label.pack(pady=(0, 20))
-        
-        # Connection section
-        conn_frame = ttk.LabelFrame(main_frame, text="Client Connection", padding="10")
-        conn_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        ttk.Label(conn_frame, text="Client IP:").pack(side=tk.LEFT)
-        self.client_ip_var = tk.StringVar()
-        ip_entry = ttk.Entry(conn_frame, textvariable=self.client_ip_var, width=20)
-        ip_entry.pack(side=tk.LEFT, padx=(5, 10))
-        
-        self.connect_btn = ttk.Button(conn_frame, text="Start Streaming", command=self.toggle_streaming)
-        self.connect_btn.pack(side=tk.LEFT, padx=(0, 5))
-        
-        # Connection status
-        self.connection_status = ttk.Label(conn_frame, text="Disconnected", foreground="red")
-        self.connection_status.pack(side=tk.LEFT, padx=(10, 0))
-        
-        # Settings
-        settings_frame = ttk.LabelFrame(main_frame, text="Stream Settings", padding="10")
-        settings_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        # Resolution
-        res_frame = ttk.Frame(settings_frame)
-        res_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(res_frame, text="Resolution:").pack(side=tk.LEFT)
-        self.resolution = tk.StringVar(value=f"{self.config_manager.stream_config.width}x{self.config_manager.stream_config.height}")
-        res_combo = ttk.Combobox(res_frame, textvariable=self.resolution, values=["1280x720", "1920x1080"], width=15)
-        res_combo.pack(side=tk.LEFT, padx=(5, 0))
-        
-        # Frame rate
-        fps_frame = ttk.Frame(settings_frame)
-        fps_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(fps_frame, text="Frame Rate:").pack(side=tk.LEFT)
-        self.fps = tk.StringVar(value=str(self.config_manager.stream_config.fps))
-        fps_combo = ttk.Combobox(fps_frame, textvariable=self.fps, values=["30", "60"], width=15)
-        fps_combo.pack(side=tk.LEFT, padx=(5, 0))
-        
-        # Bitrate
-        bitrate_frame = ttk.Frame(settings_frame)
-        bitrate_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(bitrate_frame, text="Bitrate:").pack(side=tk.LEFT)
-        self.bitrate = tk.StringVar(value=self.config_manager.stream_config.bitrate)
-        bitrate_combo = ttk.Combobox(bitrate_frame, textvariable=self.bitrate, values=["1M", "2M", "5M"], width=15)
-        bitrate_combo.pack(side=tk.LEFT, padx=(5, 0))
-        
-        # Status
-        status_frame = ttk.LabelFrame(main_frame, text="Status", padding="10")
-        status_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        
-        self.status_text = tk.Text(status_frame, height=10)
-        self.status_text.pack(fill=tk.BOTH, expand=True)
-        
-        # Buttons
-        button_frame = ttk.Frame(main_frame)
-        button_frame.pack(fill=tk.X)
-        
-        ttk.Button(button_frame, text="Apply Settings", command=self.apply_settings).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Clear Log", command=self.clear_log).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Quit", command=self.quit_app).pack(side=tk.LEFT)
-        
-        self.log("Host started. Ready to stream.")
-        self.log(f"Your IP: {self.get_local_ip()}")
-        self.log("Enter client IP and click 'Start Streaming'")
-    
-    def get_local_ip(self):
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except:
-            return "127.0.0.1"
-    
-    def toggle_streaming(self):
-        if not self.streaming:
-            self.start_streaming()
-        else:
-            self.stop_streaming()
-    
-    def start_streaming(self):
-        client_ip = self.client_ip_var.get().strip()
-        if not client_ip:
-            messagebox.showerror("Error", "Please enter client IP address")
-            return
-        
-        try:
-            width, height = map(int, self.resolution.get().split('x'))
-            fps = int(self.fps.get())
-            bitrate = self.bitrate.get()
-            
-            self.capture = HighPerformanceCapture(fps)
-            self.encoder = HardwareEncoder(width, height, fps, bitrate)
-            self.streamer = Streamer()
-            self.input_forwarder = InputForwarder()
-            
-            self.encoder.start_encoding()
-            
-            if not self.streamer.start_streaming(client_ip):
-                raise Exception("Failed to start streaming")
-            
-            if not self.input_forwarder.connect(client_ip):
-                self.log("Warning: Input forwarding not available")
-            
-            self.capture.start_capture(on_frame_callback=self.encoder.add_frame)
-            
-            self.streaming = True
-            self.stream_thread = threading.Thread(target=self._stream_packets, daemon=True)
-            self.stream_thread.start()
-            
-            self.client_ip = client_ip
-            self.connect_btn.config(text="Stop Streaming")
-            self.connection_status.config(text="Connected", foreground="green")
-            
-            self.log(f"Started streaming to {client_ip}")
-            self.log(f"Resolution: {width}x{height} {fps}fps")
-            self.log(f"Encoder: {self.encoder.encoder_name}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to start streaming: {e}")
-            self.log(f"Stream start error: {e}")
-            self.cleanup_components()
-    
-    def _stream_packets(self):
-        while self.streaming:
-            try:
-                packet = self.encoder.get_packet()
-                if packet:
-                    self.streamer.send_packet(packet)
-                else:
-                    time.sleep(0.001)
-            except Exception as e:
-                self.log(f"Packet streaming error: {e}")
-                time.sleep(0.001)
-    
-    def stop_streaming(self):
-        self.streaming = False
-        self.cleanup_components()
-        
-        self.connect_btn.config(text="Start Streaming")
-        self.connection_status.config(text="Disconnected", foreground="red")
-        self.log("Streaming stopped")
-    
-    def cleanup_components(self):
-        if self.capture:
-            self.capture.stop_capture()
-            self.capture = None
-        
-        if self.encoder:
-            self.encoder.stop_encoding()
-            self.encoder = None
-        
-        if self.streamer:
-            self.streamer.stop_streaming()
-            self.streamer = None
-        
-        if self.input_forwarder:
-            self.input_forwarder.disconnect()
-            self.input_forwarder = None
-    
-    def apply_settings(self):
-        try:
-            width, height = map(int, self.resolution.get().split('x'))
-            self.config_manager.stream_config.width = width
-            self.config_manager.stream_config.height = height
-            self.config_manager.stream_config.fps = int(self.fps.get())
-            self.config_manager.stream_config.bitrate = self.bitrate.get()
-            
-            self.log("Settings applied")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Invalid settings: {e}")
-    
-    def log(self, message):
-        self.status_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
-        self.status_text.see(tk.END)
-    
-    def clear_log(self):
-        self.status_text.delete(1.0, tk.END)
-    
-    def quit_app(self):
-        self.streaming = False
-        self.cleanup_components()
-        self.root.quit()
-    
-    def run(self):
-        try:
-            self.root.mainloop()
-        except KeyboardInterrupt:
-            self.quit_app()
-        finally:
-            self.quit_app()
-
-if __name__ == "__main__":
-    print("Starting EdgeLite Host...")
-    app = EdgeLiteHost()
-    app.run()
+import tkinter as tk
+from tkinter import ttk, messagebox
+import threading
+import time
+import queue
+import json
+import functools
+import os
+import struct
+import ctypes
+import ctypes.util
+import platform
+import subprocess
+import types
+import collections
+from concurrent.futures import ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+import socket
+import mss
+import numpy as np
+import av
+import logging
+
+try:
+    import dxcam
+    DXCAM_AVAILABLE = True
+except ImportError:
+    DXCAM_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    # orjson serializes straight to bytes, several times faster than
+    # stdlib json on the small dicts the control path ships
+    def json_dumps_bytes(obj):
+        return orjson.dumps(obj)
+
+    def json_loads_bytes(data):
+        return orjson.loads(data)
+else:
+    def json_dumps_bytes(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    def json_loads_bytes(data):
+        return json.loads(data.decode('utf-8'))
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    from Xlib import display as xlib_display
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _bgra_to_rgb_numba(src, dst):
+        for y in prange(src.shape[0]):
+            for x in range(src.shape[1]):
+                dst[y, x, 0] = src[y, x, 2]
+                dst[y, x, 1] = src[y, x, 1]
+                dst[y, x, 2] = src[y, x, 0]
+
+def bgra_to_rgb(src, dst):
+    """Fused BGRA->RGB channel pack into a preallocated destination"""
+    if NUMBA_AVAILABLE:
+        _bgra_to_rgb_numba(src, dst)
+    else:
+        dst[...] = src[:, :, 2::-1]
+
+try:
+    import objc
+    import Quartz
+    import ScreenCaptureKit
+    from CoreMedia import CMTimeMake, CMSampleBufferGetImageBuffer
+    SCK_AVAILABLE = True
+except ImportError:
+    SCK_AVAILABLE = False
+
+if SCK_AVAILABLE:
+    class _SCStreamFrameHandler(objc.lookUpClass("NSObject")):
+        """SCStreamOutput delegate - wraps each CVPixelBuffer as an ndarray"""
+
+        def initWithCallback_(self, callback):
+            self = objc.super(_SCStreamFrameHandler, self).init()
+            if self is None:
+                return None
+            self._callback = callback
+            return self
+
+        def stream_didOutputSampleBuffer_ofType_(self, stream, sample_buffer, output_type):
+            try:
+                pixel_buffer = CMSampleBufferGetImageBuffer(sample_buffer)
+                if pixel_buffer is None:
+                    return
+
+                Quartz.CVPixelBufferLockBaseAddress(pixel_buffer, 1)
+                try:
+                    height = Quartz.CVPixelBufferGetHeight(pixel_buffer)
+                    row_bytes = Quartz.CVPixelBufferGetBytesPerRow(pixel_buffer)
+                    base = Quartz.CVPixelBufferGetBaseAddress(pixel_buffer)
+                    buf = base.as_buffer(row_bytes * height)
+                    frame = np.frombuffer(buf, dtype=np.uint8).reshape(height, row_bytes // 4, 4)
+                    self._callback(frame)
+                finally:
+                    Quartz.CVPixelBufferUnlockBaseAddress(pixel_buffer, 1)
+            except Exception as e:
+                print(f"SCStream frame error: {e}")
+logging.basicConfig(level=logging.DEBUG)
+
+# platform.system()/node() can shell out on some platforms; resolve once
+_PLATFORM = platform.system().lower()
+_NODE = platform.node()
+
+# ========== CONFIGURATION ==========
+class StreamConfig:
+    def __init__(self):
+        self.width = 1280
+        self.height = 720
+        self.fps = 60
+        self.bitrate = "2M"
+        self.encoder = "auto"
+        # 'yuv420p' has capture hand the encoder its native layout so no
+        # swscale conversion runs on the encode thread; 'bgra' keeps the
+        # raw capture format and lets the encoder convert
+        self.frame_format = "yuv420p"
+
+class NetworkConfig:
+    def __init__(self):
+        self.video_port = 5555
+        self.control_port = 5556
+        self.discovery_port = 5557
+        self.buffer_size = 65536
+        # Socket tuning: OS default UDP buffers drop bursty traffic, and
+        # DSCP EF (46) puts the stream on the network's priority queue
+        self.udp_sndbuf = 4 * 1024 * 1024
+        self.udp_rcvbuf = 4 * 1024 * 1024
+        self.dscp = 46
+        # Linux qdisc band (TC_PRIO_INTERACTIVE); ignored elsewhere
+        self.so_priority = 6
+
+class ConfigManager:
+    def __init__(self):
+        self.stream_config = StreamConfig()
+        self.network_config = NetworkConfig()
+
+def apply_socket_tuning(sock, net_config):
+    """Apply configured UDP buffer sizes and DSCP tag to a socket.
+
+    Each option fails soft: platforms cap buffer sizes or reject IP_TOS,
+    and a missed tweak shouldn't stop the stream.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, net_config.udp_sndbuf)
+    except OSError:
+        pass
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, net_config.udp_rcvbuf)
+    except OSError:
+        pass
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, net_config.dscp << 2)
+    except (OSError, AttributeError):
+        pass
+    try:
+        # DSCP covers the network; SO_PRIORITY covers the local qdisc,
+        # so bursts of bulk traffic on this box can't queue ahead of us
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, net_config.so_priority)
+    except (OSError, AttributeError):
+        pass
+
+# ========== CAPTURE ==========
+class SharedFrameRing:
+    """Triple-buffered frame handoff backed by shared memory.
+
+    Single producer / single consumer: the producer writes slot
+    (seq + 1) % 3 and then publishes the new seq, the consumer maps
+    whatever slot the latest seq points at. With three slots the producer
+    is never writing the slot a consumer just mapped, so no lock is
+    needed, and because the backing store is a SharedMemory segment a
+    consumer could even live in another process without pickling.
+    """
+
+    def __init__(self, shape, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=3 * self.frame_bytes)
+        self._slots = [np.ndarray(self.shape, self.dtype, buffer=self.shm.buf,
+                                  offset=i * self.frame_bytes)
+                       for i in range(3)]
+        self.seq = 0
+
+    def write(self, frame):
+        """Copy a frame into the next slot and publish it; returns the slot"""
+        idx = (self.seq + 1) % 3
+        np.copyto(self._slots[idx], frame)
+        self.seq += 1
+        return self._slots[idx]
+
+    def read_latest(self):
+        """Return a view of the most recently published frame, or None"""
+        if self.seq == 0:
+            return None
+        return self._slots[self.seq % 3]
+
+    def close(self):
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except Exception:
+            pass
+
+
+class _LinuxXShmCapture:
+    """X11 MIT-SHM capture: XShmGetImage into a shared-memory segment.
+
+    mss on Linux goes through XGetImage, which copies every frame over the
+    X socket; with MIT-SHM the server writes into a segment we mapped once,
+    so a grab is just a round-trip request plus a DMA into our buffer.
+    """
+
+    _ZPIXMAP = 2
+    _IPC_CREAT = 0o1000
+    _IPC_RMID = 0
+
+    class _ShmSegmentInfo(ctypes.Structure):
+        _fields_ = [("shmseg", ctypes.c_ulong),
+                    ("shmid", ctypes.c_int),
+                    ("shmaddr", ctypes.c_void_p),
+                    ("readOnly", ctypes.c_int)]
+
+    class _XImage(ctypes.Structure):
+        _fields_ = [("width", ctypes.c_int), ("height", ctypes.c_int),
+                    ("xoffset", ctypes.c_int), ("format", ctypes.c_int),
+                    ("data", ctypes.c_void_p), ("byte_order", ctypes.c_int),
+                    ("bitmap_unit", ctypes.c_int), ("bitmap_bit_order", ctypes.c_int),
+                    ("bitmap_pad", ctypes.c_int), ("depth", ctypes.c_int),
+                    ("bytes_per_line", ctypes.c_int), ("bits_per_pixel", ctypes.c_int),
+                    ("red_mask", ctypes.c_ulong), ("green_mask", ctypes.c_ulong),
+                    ("blue_mask", ctypes.c_ulong)]
+
+    def __init__(self):
+        self.display = None
+        self.root = None
+        self.width = 0
+        self.height = 0
+        self.ximage = None
+        self.shminfo = None
+        self.size = 0
+        self.xlib = None
+        self.xext = None
+        self.libc = None
+
+    @classmethod
+    def create(cls):
+        if not os.environ.get("DISPLAY"):
+            return None
+        try:
+            self = cls()
+            self.xlib = ctypes.CDLL(ctypes.util.find_library("X11") or "libX11.so.6")
+            self.xext = ctypes.CDLL(ctypes.util.find_library("Xext") or "libXext.so.6")
+            self.libc = ctypes.CDLL(None, use_errno=True)
+
+            self.xlib.XOpenDisplay.restype = ctypes.c_void_p
+            self.xlib.XDefaultVisual.restype = ctypes.c_void_p
+            self.xlib.XRootWindow.restype = ctypes.c_ulong
+            self.xext.XShmCreateImage.restype = ctypes.POINTER(cls._XImage)
+            self.libc.shmat.restype = ctypes.c_void_p
+
+            self.display = self.xlib.XOpenDisplay(None)
+            if not self.display:
+                return None
+            if not self.xext.XShmQueryExtension(ctypes.c_void_p(self.display)):
+                print("MIT-SHM extension not available - falling back to mss")
+                return None
+
+            screen = self.xlib.XDefaultScreen(ctypes.c_void_p(self.display))
+            self.root = self.xlib.XRootWindow(ctypes.c_void_p(self.display), screen)
+            visual = self.xlib.XDefaultVisual(ctypes.c_void_p(self.display), screen)
+            depth = self.xlib.XDefaultDepth(ctypes.c_void_p(self.display), screen)
+            self.width = self.xlib.XDisplayWidth(ctypes.c_void_p(self.display), screen)
+            self.height = self.xlib.XDisplayHeight(ctypes.c_void_p(self.display), screen)
+
+            self.shminfo = cls._ShmSegmentInfo()
+            self.ximage = self.xext.XShmCreateImage(
+                ctypes.c_void_p(self.display), ctypes.c_void_p(visual), depth,
+                cls._ZPIXMAP, None, ctypes.byref(self.shminfo),
+                self.width, self.height)
+            if not self.ximage:
+                return None
+
+            self.size = self.ximage.contents.bytes_per_line * self.ximage.contents.height
+            shmid = self.libc.shmget(0, self.size, cls._IPC_CREAT | 0o600)
+            if shmid < 0:
+                return None
+            shmaddr = self.libc.shmat(shmid, None, 0)
+            self.shminfo.shmid = shmid
+            self.shminfo.shmaddr = shmaddr
+            self.shminfo.readOnly = 0
+            self.ximage.contents.data = shmaddr
+
+            self.xext.XShmAttach(ctypes.c_void_p(self.display), ctypes.byref(self.shminfo))
+            self.xlib.XSync(ctypes.c_void_p(self.display), 0)
+            # Mark for removal now so the segment dies with the process
+            self.libc.shmctl(shmid, cls._IPC_RMID, None)
+            return self
+
+        except Exception as e:
+            print(f"XShm setup failed, falling back to mss: {e}")
+            return None
+
+    def grab(self):
+        """Grab the root window into the shared segment, return BGRA view"""
+        all_planes = ctypes.c_ulong(-1 & 0xFFFFFFFFFFFFFFFF)
+        if not self.xext.XShmGetImage(ctypes.c_void_p(self.display), self.root,
+                                      self.ximage, 0, 0, all_planes):
+            return None
+        raw = (ctypes.c_ubyte * self.size).from_address(self.shminfo.shmaddr)
+        row_pixels = self.ximage.contents.bytes_per_line // 4
+        frame = np.frombuffer(raw, dtype=np.uint8).reshape(self.height, row_pixels, 4)
+        return frame[:, :self.width]
+
+    def close(self):
+        try:
+            if self.display:
+                self.xext.XShmDetach(ctypes.c_void_p(self.display), ctypes.byref(self.shminfo))
+                self.xlib.XCloseDisplay(ctypes.c_void_p(self.display))
+                self.display = None
+            if self.shminfo is not None and self.shminfo.shmaddr:
+                self.libc.shmdt(ctypes.c_void_p(self.shminfo.shmaddr))
+        except Exception as e:
+            print(f"XShm cleanup error: {e}")
+
+
+class HighPerformanceCapture:
+    def __init__(self, target_fps=60, pixel_format="bgra"):
+        self.target_fps = target_fps
+        # 'yuv420' converts at capture time for encoder-bound frames:
+        # 1.5 bytes/pixel instead of 4 through every downstream queue and
+        # copy, and it is the layout H.264 encoders want anyway. Display
+        # consumers keep the default BGRA
+        self.pixel_format = pixel_format if CV2_AVAILABLE else "bgra"
+        self.running = False
+        # Single-slot queue with newest-wins replacement: only the latest
+        # frame matters, so the producer swaps it rather than queueing depth
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.thread = None
+        self.frame_count = 0
+        self.platform = _PLATFORM
+
+        # Window-lookup cache: window_name -> (timestamp, rect)
+        self._window_cache = {}
+        self._window_cache_ttl = 1.0
+        # X11 connection and per-name Window handles, created lazily so
+        # repeat geometry reads skip the full tree walk
+        self._x_display = None
+        self._x_window_handles = {}
+
+        # Platform dispatch bound once instead of an if/elif chain per call
+        self._find_window_impl = {
+            "windows": self._find_windows_window,
+            "darwin": self._find_macos_window,
+            "linux": self._find_linux_window,
+        }.get(self.platform, lambda window_name: None)
+
+        # Capture-time moving average over the last 60 frames, kept as a
+        # ring buffer with a running sum so updates are O(1) per frame.
+        # Plain Python floats on purpose: an ndarray here would box an
+        # np.float64 on every indexed read in the hot loop
+        self._frame_ring = None
+
+        # Lateness diagnostics, aggregated so logging can't become its own
+        # bottleneck under load
+        self._late_frames = 0
+        self._last_late_log = 0.0
+
+        self.average_capture_time = 0.0
+        self._ct_ring = [0.0] * 60
+        self._ct_idx = 0
+        self._ct_sum = 0.0
+        self._ct_count = 0
+
+    def find_game_window(self, window_name):
+        """Locate a window by title, returns (x, y, width, height) or None.
+
+        Results are cached for a short TTL because the platform lookups can
+        cost tens to hundreds of ms per call (osascript alone is ~100-200ms),
+        which is catastrophic if this ever runs inside a polling loop.
+        """
+        now = time.monotonic()
+        cached = self._window_cache.get(window_name)
+        if cached is not None and now - cached[0] < self._window_cache_ttl:
+            return cached[1]
+
+        rect = self._find_window_impl(window_name)
+        self._window_cache[window_name] = (now, rect)
+        return rect
+
+    def _find_windows_window(self, window_name):
+        try:
+            user32 = ctypes.windll.user32
+            hwnd = user32.FindWindowW(None, window_name)
+            if not hwnd:
+                return None
+            rect = (ctypes.c_long * 4)()
+            if not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+                return None
+            left, top, right, bottom = rect
+            return (left, top, right - left, bottom - top)
+        except Exception as e:
+            print(f"Window lookup error: {e}")
+            return None
+
+    def _find_macos_window(self, window_name):
+        # In-process Quartz query when pyobjc is present - no osascript fork
+        if SCK_AVAILABLE:
+            try:
+                windows = Quartz.CGWindowListCopyWindowInfo(
+                    Quartz.kCGWindowListOptionOnScreenOnly, Quartz.kCGNullWindowID)
+                for info in windows:
+                    name = info.get('kCGWindowName') or ''
+                    owner = info.get('kCGWindowOwnerName') or ''
+                    if window_name in name or window_name in owner:
+                        bounds = info.get('kCGWindowBounds')
+                        return (int(bounds['X']), int(bounds['Y']),
+                                int(bounds['Width']), int(bounds['Height']))
+                return None
+            except Exception as e:
+                print(f"Window lookup error: {e}")
+        # osascript fallback: slow (~100-200ms), but results are cached
+        try:
+            script = (f'tell application "System Events" to get '
+                      f'{{position, size}} of first window of '
+                      f'(first process whose name contains "{window_name}")')
+            result = subprocess.run(['osascript', '-e', script],
+                                    capture_output=True, text=True, timeout=5)
+            if result.returncode != 0:
+                return None
+            parts = [int(p) for p in result.stdout.strip().split(', ')]
+            if len(parts) == 4:
+                return tuple(parts)
+        except Exception as e:
+            print(f"Window lookup error: {e}")
+        return None
+
+    def _find_linux_window(self, window_name):
+        # In-process X11 query when python-xlib is present: the xdotool
+        # route forks twice per lookup (~10-40ms) and scrapes text output
+        if XLIB_AVAILABLE and os.environ.get("DISPLAY"):
+            try:
+                return self._find_linux_window_xlib(window_name)
+            except Exception as e:
+                print(f"Window lookup error: {e}")
+                return None
+        return self._find_linux_window_xdotool(window_name)
+
+    def _find_linux_window_xlib(self, window_name):
+        if self._x_display is None:
+            self._x_display = xlib_display.Display()
+        root = self._x_display.screen().root
+
+        # Re-validate a cached Window handle before walking the whole tree
+        win = self._x_window_handles.get(window_name)
+        if win is not None:
+            try:
+                return self._x_window_rect(win, root)
+            except Exception:
+                del self._x_window_handles[window_name]
+
+        win = self._search_x_window_tree(root, window_name)
+        if win is None:
+            return None
+        self._x_window_handles[window_name] = win
+        return self._x_window_rect(win, root)
+
+    def _search_x_window_tree(self, window, window_name):
+        try:
+            name = window.get_wm_name()
+            if isinstance(name, bytes):
+                name = name.decode('latin-1')
+            if name and window_name in name:
+                return window
+            for child in window.query_tree().children:
+                found = self._search_x_window_tree(child, window_name)
+                if found is not None:
+                    return found
+        except Exception:
+            pass
+        return None
+
+    def _x_window_rect(self, win, root):
+        geo = win.get_geometry()
+        coords = root.translate_coords(win, 0, 0)
+        return (coords.x, coords.y, geo.width, geo.height)
+
+    def _find_linux_window_xdotool(self, window_name):
+        try:
+            result = subprocess.run(['xdotool', 'search', '--name', window_name],
+                                    capture_output=True, text=True, timeout=5)
+            if result.returncode != 0 or not result.stdout.strip():
+                return None
+            window_id = result.stdout.strip().split('\n')[0]
+            result = subprocess.run(['xdotool', 'getwindowgeometry', '--shell', window_id],
+                                    capture_output=True, text=True, timeout=5)
+            if result.returncode != 0:
+                return None
+            geo = dict(line.split('=') for line in result.stdout.strip().split('\n') if '=' in line)
+            return (int(geo['X']), int(geo['Y']), int(geo['WIDTH']), int(geo['HEIGHT']))
+        except Exception as e:
+            print(f"Window lookup error: {e}")
+            return None
+
+    def _note_behind_schedule(self):
+        """Aggregate lateness and report at most once per second.
+
+        A print per late frame flushes stdout (and can block on terminal
+        I/O) from inside the hot loop, turning a small slip into a cascade
+        of further missed frames.
+        """
+        self._late_frames += 1
+        now = time.monotonic()
+        if now - self._last_late_log >= 1.0:
+            print(f"Capture behind schedule: {self._late_frames} late frames in the last second")
+            self._late_frames = 0
+            self._last_late_log = now
+
+    def _publish_frame(self, frame, on_frame_callback=None):
+        if self.pixel_format == "yuv420" and frame.ndim == 3 and frame.shape[2] == 4:
+            # I420 planes stacked as (h*3/2, w) uint8
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2YUV_I420)
+
+        # Copy into the shared triple buffer before anything else sees
+        # the frame: backend-owned views (dxcam's reused buffer, a
+        # CVPixelBuffer that gets unlocked when the capture callback
+        # returns) can be recycled the moment this call ends, so the
+        # callback and the queue both get the stable slot, which lives
+        # for at least two more frames
+        if self._frame_ring is None or self._frame_ring.shape != frame.shape:
+            if self._frame_ring is not None:
+                self._frame_ring.close()
+            self._frame_ring = SharedFrameRing(frame.shape)
+        stable = self._frame_ring.write(frame)
+
+        self.frame_count += 1
+
+        if on_frame_callback:
+            on_frame_callback(stable)
+
+        try:
+            self.frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self.frame_queue.put_nowait(stable)
+        except queue.Full:
+            pass
+
+    def get_latest_frame(self):
+        """Most recently captured frame (shared-memory view), or None"""
+        if self._frame_ring is not None:
+            return self._frame_ring.read_latest()
+        return None
+
+    def _record_capture_time(self, capture_time):
+        old = self._ct_ring[self._ct_idx]
+        self._ct_ring[self._ct_idx] = capture_time
+        self._ct_sum += capture_time - old
+        self._ct_idx = (self._ct_idx + 1) % 60
+        self._ct_count = min(60, self._ct_count + 1)
+        self.average_capture_time = self._ct_sum / self._ct_count
+
+    def start_capture(self, on_frame_callback=None):
+        self.running = True
+        if self.platform == "windows":
+            # Drop the sleep timer tick to 1ms so pacing sleeps are accurate
+            try:
+                ctypes.windll.winmm.timeBeginPeriod(1)
+            except Exception:
+                pass
+        self.thread = threading.Thread(target=self._capture_loop, args=(on_frame_callback,), daemon=True)
+        self.thread.start()
+
+    def _wait_until(self, deadline):
+        """Sleep most of the way to deadline, spin the last ~1.5ms.
+
+        time.sleep granularity is 1-16ms depending on platform; the short
+        busy-wait tail keeps frame pacing jitter under a millisecond.
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining > 0.0015:
+            time.sleep(remaining - 0.0015)
+        while time.perf_counter() < deadline:
+            pass
+
+    def _create_dxcam_camera(self):
+        """Windows fast path: DXGI Desktop Duplication via dxcam (no GDI BitBlt)"""
+        if self.platform != "windows" or not DXCAM_AVAILABLE:
+            return None
+        try:
+            camera = dxcam.create(output_idx=0, output_color="BGRA")
+            if camera is None:
+                print("dxcam.create() returned None - falling back to mss")
+                return None
+            camera.start(target_fps=self.target_fps, video_mode=True)
+            return camera
+        except Exception as e:
+            print(f"dxcam setup failed, falling back to mss: {e}")
+            return None
+
+    def _boost_thread_priority(self):
+        """Ask the OS for real-time-ish scheduling on the capture thread.
+
+        A 60fps capture loop loses frames whenever it gets preempted for
+        longer than a frame interval; SCHED_FIFO (Linux) or MMCSS (Windows)
+        keeps ordinary background load from doing that. Needs privileges on
+        Linux, so failure is expected and non-fatal.
+        """
+        try:
+            if self.platform == "linux":
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+            elif self.platform == "windows":
+                task_index = ctypes.c_ulong(0)
+                ctypes.windll.avrt.AvSetMmThreadCharacteristicsW(
+                    "Pro Audio", ctypes.byref(task_index))
+        except Exception as e:
+            print(f"Capture thread priority boost unavailable: {e}")
+
+    def _capture_loop(self, on_frame_callback=None):
+        self._boost_thread_priority()
+        camera = self._create_dxcam_camera()
+        if camera is not None:
+            self._dxcam_capture_loop(camera, on_frame_callback)
+            return
+
+        stream = self._create_sck_stream(on_frame_callback)
+        if stream is not None:
+            self._sck_capture_loop(stream)
+            return
+
+        if self.platform == "linux":
+            xshm = _LinuxXShmCapture.create()
+            if xshm is not None:
+                self._xshm_capture_loop(xshm, on_frame_callback)
+                return
+
+        self._mss_capture_loop(on_frame_callback)
+
+    def _xshm_capture_loop(self, xshm, on_frame_callback=None):
+        print("Using X11 MIT-SHM capture")
+        target_frame_time = 1.0 / self.target_fps
+        next_deadline = time.perf_counter() + target_frame_time
+        try:
+            while self.running:
+                frame_start = time.perf_counter()
+
+                try:
+                    frame = xshm.grab()
+                    if frame is None:
+                        time.sleep(0.001)
+                        continue
+
+                    self._record_capture_time(time.perf_counter() - frame_start)
+                    self._publish_frame(frame, on_frame_callback)
+
+                    self._wait_until(next_deadline)
+                    next_deadline += target_frame_time
+                    if next_deadline < time.perf_counter():
+                        # More than a frame behind - resync instead of
+                        # letting the deadline recede forever
+                        self._note_behind_schedule()
+                        next_deadline = time.perf_counter() + target_frame_time
+
+                except Exception as e:
+                    print(f"Capture error: {e}")
+                    time.sleep(0.001)
+        finally:
+            xshm.close()
+
+    def _create_sck_stream(self, on_frame_callback=None):
+        """macOS fast path: ScreenCaptureKit SCStream (macOS 12.3+).
+
+        mss on Darwin goes through CGDisplayCreateImage and pins
+        WindowServer; SCStream delivers frames from the compositor instead.
+        """
+        if self.platform != "darwin" or not SCK_AVAILABLE:
+            return None
+        try:
+            result = {}
+            done = threading.Event()
+
+            def completion(content, error):
+                result['content'] = content
+                result['error'] = error
+                done.set()
+
+            ScreenCaptureKit.SCShareableContent.getShareableContentWithCompletionHandler_(completion)
+            if not done.wait(5.0) or result.get('error') or not result.get('content'):
+                print("ScreenCaptureKit content query failed - falling back to mss")
+                return None
+
+            display = result['content'].displays()[0]
+            content_filter = ScreenCaptureKit.SCContentFilter.alloc().initWithDisplay_excludingWindows_(display, [])
+
+            config = ScreenCaptureKit.SCStreamConfiguration.alloc().init()
+            config.setWidth_(display.width())
+            config.setHeight_(display.height())
+            config.setPixelFormat_(Quartz.kCVPixelFormatType_32BGRA)
+            config.setMinimumFrameInterval_(CMTimeMake(1, self.target_fps))
+
+            stream = ScreenCaptureKit.SCStream.alloc().initWithFilter_configuration_delegate_(
+                content_filter, config, None)
+
+            def handle_frame(frame):
+                self._publish_frame(frame, on_frame_callback)
+
+            handler = _SCStreamFrameHandler.alloc().initWithCallback_(handle_frame)
+            stream.addStreamOutput_type_sampleHandlerQueue_error_(handler, 0, None, None)
+            stream.startCaptureWithCompletionHandler_(lambda error: None)
+            # Keep the handler alive for the lifetime of the stream
+            self._sck_handler = handler
+            return stream
+
+        except Exception as e:
+            print(f"ScreenCaptureKit setup failed, falling back to mss: {e}")
+            return None
+
+    def _sck_capture_loop(self, stream):
+        print("Using ScreenCaptureKit capture")
+        try:
+            while self.running:
+                # Frames are delivered on the SCStream callback queue
+                time.sleep(0.1)
+        finally:
+            try:
+                stream.stopCaptureWithCompletionHandler_(lambda error: None)
+            except Exception as e:
+                print(f"SCStream stop error: {e}")
+
+    def _dxcam_capture_loop(self, camera, on_frame_callback=None):
+        print("Using dxcam Desktop Duplication capture")
+        try:
+            while self.running:
+                try:
+                    # Frames arrive as zero-copy views of the shared texture,
+                    # already paced to target_fps by video_mode
+                    frame = camera.get_latest_frame()
+                    if frame is None:
+                        continue
+
+                    self._publish_frame(frame, on_frame_callback)
+
+                except Exception as e:
+                    print(f"Capture error: {e}")
+                    time.sleep(0.001)
+        finally:
+            camera.stop()
+
+    def _mss_capture_loop(self, on_frame_callback=None):
+        with mss.mss() as sct:
+            monitor = sct.monitors[1]
+            target_frame_time = 1.0 / self.target_fps
+            next_deadline = time.perf_counter() + target_frame_time
+
+            while self.running:
+                frame_start = time.perf_counter()
+
+                try:
+                    # Zero-copy BGRA view over the ScreenShot's raw
+                    # bytes; mss allocates a fresh raw buffer per grab,
+                    # so the ring copy in _publish_frame is the only
+                    # per-frame cost this path pays
+                    screenshot = sct.grab(monitor)
+                    frame = np.frombuffer(screenshot.raw, np.uint8).reshape(
+                        screenshot.height, screenshot.width, 4)
+
+                    self._record_capture_time(time.perf_counter() - frame_start)
+                    self._publish_frame(frame, on_frame_callback)
+
+                    self._wait_until(next_deadline)
+                    next_deadline += target_frame_time
+                    if next_deadline < time.perf_counter():
+                        # More than a frame behind - resync instead of
+                        # letting the deadline recede forever
+                        self._note_behind_schedule()
+                        next_deadline = time.perf_counter() + target_frame_time
+
+
+                except Exception as e:
+                    print(f"Capture error: {e}")
+                    time.sleep(0.001)
+    
+    def stop_capture(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        if self._frame_ring is not None:
+            # Unlink the SharedMemory segment now rather than leaking it
+            # until interpreter exit
+            self._frame_ring.close()
+            self._frame_ring = None
+        if self.platform == "windows":
+            try:
+                ctypes.windll.winmm.timeEndPeriod(1)
+            except Exception:
+                pass
+
+# ========== ENCODER ==========
+class HardwareEncoder:
+    def __init__(self, width, height, fps=60, bitrate="2M"):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.bitrate = bitrate
+        self.running = False
+        
+        # Single-slot newest-wins input, like the capture-side queue:
+        # a deeper queue would let the encoder sit on references to
+        # every SharedFrameRing slot, and the ring only keeps a
+        # published slot stable for two subsequent writes. With at most
+        # one queued frame plus one being encoded, the encoder never
+        # holds a slot old enough for the capture thread to overwrite.
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.packet_queue = queue.Queue(maxsize=10)
+        
+        self.encoder_name = self._select_hardware_encoder()
+        self.codec_context = None
+        self._rgb_buffer = None
+        self._frame_pool = []
+        self._pool_idx = 0
+        # Packets arrive from the queue a frame at a time; consumers drain
+        # this buffer before taking the queue lock again
+        self._packet_buffer = []
+
+        # Fixed ring + running sum keeps the rolling mean O(1) per frame,
+        # same scheme as the capture-time tracker
+        self.average_encode_time = 0.0
+        self._et_ring = [0.0] * 60
+        self._et_idx = 0
+        self._et_sum = 0.0
+        self._et_count = 0
+        
+        print(f"Using encoder: {self.encoder_name}")
+    
+    _ENCODER_BY_PLATFORM = {
+        "windows": "h264_nvenc",
+        "darwin": "h264_videotoolbox",
+    }
+
+    def _select_hardware_encoder(self):
+        return self._ENCODER_BY_PLATFORM.get(_PLATFORM, "libx264")
+    
+    def _setup_codec(self):
+        try:
+            self.codec_context = av.CodecContext.create(self.encoder_name, 'w')
+            self.codec_context.width = self.width
+            self.codec_context.height = self.height
+            self.codec_context.framerate = self.fps
+            self.codec_context.pix_fmt = 'yuv420p'
+            
+            if 'M' in self.bitrate:
+                bitrate_int = int(float(self.bitrate.replace('M', '')) * 1000000)
+            else:
+                bitrate_int = int(self.bitrate)
+            
+            self.codec_context.bit_rate = bitrate_int
+            
+            if self.encoder_name in ['h264_nvenc']:
+                self.codec_context.options = {
+                    'preset': 'p1',
+                    'tune': 'ull',
+                    'rc': 'cbr',
+                }
+            
+            self.codec_context.open()
+
+            # Reusable frames for the I420 fast path - copying planes into
+            # these beats allocating a fresh AVFrame + buffers per frame
+            self._frame_pool = [av.VideoFrame(self.width, self.height, 'yuv420p')
+                                for _ in range(4)]
+            self._pool_idx = 0
+
+        except Exception as e:
+            print(f"Encoder setup failed: {e}")
+            raise
+
+    def _pooled_yuv_frame(self, frame):
+        """Copy an I420 capture frame into a recycled pooled VideoFrame.
+
+        Returns None when the capture size doesn't match the encoder so
+        the caller can fall back to from_ndarray + reformat.
+        """
+        h, w = self.height, self.width
+        if not self._frame_pool or frame.shape != (h * 3 // 2, w):
+            return None
+
+        vf = self._frame_pool[self._pool_idx]
+        self._pool_idx = (self._pool_idx + 1) % len(self._frame_pool)
+
+        sources = (
+            (frame[:h], h, w),
+            (frame[h:h + h // 4].reshape(h // 2, w // 2), h // 2, w // 2),
+            (frame[h + h // 4:].reshape(h // 2, w // 2), h // 2, w // 2),
+        )
+        for plane, (src, ph, pw) in zip(vf.planes, sources):
+            stride = plane.line_size
+            dst = np.frombuffer(plane, np.uint8)[:stride * ph]
+            np.copyto(dst.reshape(ph, stride)[:, :pw], src)
+        return vf
+    
+    def _record_encode_time(self, encode_time):
+        old = self._et_ring[self._et_idx]
+        self._et_ring[self._et_idx] = encode_time
+        self._et_sum += encode_time - old
+        self._et_idx = (self._et_idx + 1) % 60
+        self._et_count = min(60, self._et_count + 1)
+        self.average_encode_time = self._et_sum / self._et_count
+
+    def start_encoding(self):
+        self._setup_codec()
+        self.running = True
+        self.encode_thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.encode_thread.start()
+    
+    def _encode_loop(self):
+        while self.running:
+            try:
+                frame = self.frame_queue.get(timeout=0.001)
+                if frame is None:
+                    continue
+
+                encode_start = time.perf_counter()
+                if frame.ndim == 2:
+                    # Already I420 from capture-time conversion - goes
+                    # straight in as the encoder's native pixel format
+                    av_frame = self._pooled_yuv_frame(frame)
+                    if av_frame is None:
+                        av_frame = av.VideoFrame.from_ndarray(frame, format='yuv420p')
+                        av_frame = av_frame.reformat(width=self.width, height=self.height)
+                else:
+                    if frame.shape[2] == 4:
+                        # Capture backends hand us BGRA; pack to RGB in one
+                        # pass (numba-parallel when available) into a reused
+                        # buffer before handing the frame to PyAV
+                        if (self._rgb_buffer is None
+                                or self._rgb_buffer.shape[:2] != frame.shape[:2]):
+                            self._rgb_buffer = np.empty(
+                                (frame.shape[0], frame.shape[1], 3), np.uint8)
+                        bgra_to_rgb(frame, self._rgb_buffer)
+                        frame = self._rgb_buffer
+                    av_frame = av.VideoFrame.from_ndarray(frame, format='rgb24')
+                    av_frame = av_frame.reformat(width=self.width, height=self.height)
+
+                packets = self.codec_context.encode(av_frame)
+                self._record_encode_time(time.perf_counter() - encode_start)
+
+                # One put per frame: an IDR frame comes with SPS/PPS, and
+                # pushing each packet separately pays the queue's lock and
+                # condvar dance 3-5 times
+                packets = [p for p in packets if p]
+                if packets and not self.packet_queue.full():
+                    self.packet_queue.put_nowait(packets)
+
+            except queue.Empty:
+                continue
+            except Exception as e:
+                print(f"Encoding error: {e}")
+                time.sleep(0.001)
+    
+    def add_frame(self, frame):
+        if not self.running:
+            return
+        # Replace whatever is waiting with the newest frame; encoding a
+        # stale frame only adds latency
+        try:
+            self.frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self.frame_queue.put_nowait(frame)
+        except queue.Full:
+            pass
+    
+    def get_packet(self, timeout=None):
+        """Next encoded packet; waits on the queue's condvar when a
+        timeout is given instead of making callers poll"""
+        if self._packet_buffer:
+            return self._packet_buffer.pop(0)
+        try:
+            if timeout is None:
+                self._packet_buffer = self.packet_queue.get_nowait()
+            else:
+                self._packet_buffer = self.packet_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return self._packet_buffer.pop(0)
+    
+    def stop_encoding(self):
+        self.running = False
+        # Don't call close() on codec_context - it doesn't exist
+        # The context will be garbage collected automatically
+        self.codec_context = None
+
+# ========== NETWORK ==========
+class Streamer:
+    def __init__(self, video_port=5555, control_port=5556, net_config=None):
+        self.video_port = video_port
+        self.control_port = control_port
+        self.net_config = net_config or NetworkConfig()
+        self.running = False
+        self.video_socket = None
+        self.client_address = None
+        self.packet_queue = queue.Queue(maxsize=20)
+        self.sent_packets = 0
+        # A fragmented UDP datagram is lost whole if any fragment drops,
+        # so keep every send under the path MTU (28 bytes of IP+UDP header)
+        self.mtu = 1500
+        self._payload_cap = self.mtu - 28
+
+    @staticmethod
+    def _forbid_fragmentation(sock):
+        """Set DF on the socket so oversized sends fail loudly (Linux only)"""
+        mtu_discover = getattr(socket, 'IP_MTU_DISCOVER', None)
+        pmtudisc_do = getattr(socket, 'IP_PMTUDISC_DO', None)
+        if mtu_discover is None or pmtudisc_do is None:
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, mtu_discover, pmtudisc_do)
+        except OSError as e:
+            print(f"MTU discover setup skipped: {e}")
+
+    def start_streaming(self, client_ip):
+        try:
+            self.client_address = (client_ip, self.video_port)
+            self.video_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            apply_socket_tuning(self.video_socket, self.net_config)
+            self._forbid_fragmentation(self.video_socket)
+
+            self.running = True
+            self.stream_thread = threading.Thread(target=self._streaming_loop, daemon=True)
+            self.stream_thread.start()
+            
+            return True
+            
+        except Exception as e:
+            print(f"Stream start error: {e}")
+            return False
+    
+    def _streaming_loop(self):
+        while self.running:
+            try:
+                packet = self.packet_queue.get(timeout=0.001)
+                if packet is None:
+                    continue
+                
+                packet_data = packet.to_bytes()
+                # ffmpeg's UDP reader treats datagrams as a byte stream, so
+                # large packets (keyframes) are chunked below the MTU rather
+                # than left to IP fragmentation
+                cap = self._payload_cap
+                if len(packet_data) <= cap:
+                    self.video_socket.sendto(packet_data, self.client_address)
+                else:
+                    for i in range(0, len(packet_data), cap):
+                        self.video_socket.sendto(packet_data[i:i + cap], self.client_address)
+                self.sent_packets += 1
+                
+            except queue.Empty:
+                continue
+            except Exception as e:
+                print(f"Streaming error: {e}")
+                time.sleep(0.001)
+    
+    def send_packet(self, packet):
+        if self.running and not self.packet_queue.full():
+            try:
+                self.packet_queue.put_nowait(packet)
+            except queue.Full:
+                pass
+    
+    def stop_streaming(self):
+        self.running = False
+        if self.video_socket:
+            self.video_socket.close()
+
+# ========== DISCOVERY ==========
+class NetworkDiscovery:
+    """Answers client discovery broadcasts so clients can find this host"""
+
+    def __init__(self, discovery_port=5557, video_port=5555, control_port=5556, net_config=None):
+        self.discovery_port = discovery_port
+        self.video_port = video_port
+        self.control_port = control_port
+        self.net_config = net_config or NetworkConfig()
+        self.running = False
+        self.socket = None
+        self.thread = None
+        # Static fields never change, so serialize them once and only
+        # append the timestamp per reply instead of re-running dumps.
+        self._response_prefix = json_dumps_bytes({
+            'type': 'host',
+            'name': _NODE,
+            'video_port': video_port,
+            'control_port': control_port,
+        })[:-1]
+
+    def _build_response(self):
+        return self._response_prefix + b',"timestamp":' + repr(time.time()).encode('ascii') + b'}'
+
+    def start_discovery(self):
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            apply_socket_tuning(self.socket, self.net_config)
+            self.socket.bind(("", self.discovery_port))
+            self.socket.settimeout(0.5)
+
+            self.running = True
+            self.thread = threading.Thread(target=self._discovery_loop, daemon=True)
+            self.thread.start()
+            return True
+        except Exception as e:
+            print(f"Discovery start error: {e}")
+            return False
+
+    def _discovery_loop(self):
+        while self.running:
+            for data, addr in self._batched_recv():
+                try:
+                    self._handle_message(data, addr)
+                except Exception as e:
+                    print(f"Discovery message error: {e}")
+
+    def _batched_recv(self, max_packets=32):
+        """Drain up to max_packets datagrams per wakeup.
+
+        Python's socket module exposes no recvmmsg, but one blocking read
+        followed by a non-blocking drain gets most of the same syscall
+        amortization when broadcasts arrive in bursts.
+        """
+        batch = []
+        try:
+            batch.append(self.socket.recvfrom(1024))
+        except (socket.timeout, OSError):
+            return batch
+
+        self.socket.setblocking(False)
+        try:
+            while len(batch) < max_packets:
+                try:
+                    batch.append(self.socket.recvfrom(1024))
+                except (BlockingIOError, socket.timeout, OSError):
+                    break
+        finally:
+            self.socket.settimeout(0.5)
+        return batch
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _parse_message(data):
+        """Parse a discovery datagram, caching by payload bytes.
+
+        Clients re-send identical probe bytes every couple of seconds, so
+        repeats short-circuit to the already-parsed result. The dict is
+        shared between hits and must not be mutated by callers.
+        """
+        return json_loads_bytes(data)
+
+    def _handle_message(self, data, addr):
+        message = self._parse_message(data)
+        if message.get('type') != 'discover':
+            return
+        self.socket.sendto(self._build_response(), addr)
+
+    def stop_discovery(self):
+        self.running = False
+        if self.socket:
+            self.socket.close()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+# ========== INPUT ==========
+try:
+    from pynput import mouse, keyboard
+    import pyautogui
+    INPUT_AVAILABLE = True
+except ImportError:
+    INPUT_AVAILABLE = False
+    print("Input libraries not available - input forwarding disabled")
+
+if INPUT_AVAILABLE:
+    # pyautogui sleeps 100ms after every action by default, which would
+    # serialize simulated input to ~10 events/s
+    pyautogui.PAUSE = 0
+
+# Enum -> name maps so hot pynput callbacks do one dict lookup instead of
+# str(enum) + .replace building a fresh string per event
+if INPUT_AVAILABLE:
+    BUTTON_NAME_BY_ENUM = {b: b.name for b in mouse.Button}
+    KEY_NAME_BY_ENUM = {k: k.name for k in keyboard.Key}
+else:
+    BUTTON_NAME_BY_ENUM = {}
+    KEY_NAME_BY_ENUM = {}
+
+# Binary wire format for client input events - mirrors the constants in
+# client.py. Fixed 26-byte records, little-endian:
+#   B  event type (mouse/keyboard)
+#   B  action
+#   i  f1        mouse: x          keyboard: key code / ordinal
+#   i  f2        mouse: y          keyboard: 1 if special key else 0
+#   i  f3        mouse: button id (press/release) or dx (scroll)
+#   i  f4        mouse: dy (scroll)
+#   Q  timestamp_ns
+INPUT_EVENT_STRUCT = struct.Struct('<BBiiiiQ')
+
+EVENT_MOUSE = 1
+EVENT_KEYBOARD = 2
+MOUSE_MOVE, MOUSE_PRESS, MOUSE_RELEASE, MOUSE_SCROLL = 0, 1, 2, 3
+KEY_PRESS, KEY_RELEASE = 0, 1
+
+BUTTON_NAME_BY_ID = {1: 'left', 2: 'right', 3: 'middle'}
+BUTTON_ID_BY_NAME = {name: bid for bid, name in BUTTON_NAME_BY_ID.items()}
+
+# Monotonic is cheaper than wall time on some platforms and returns an
+# int; consumers only ever compare event timestamps to each other
+_now_ns = time.monotonic_ns
+
+SPECIAL_KEY_NAMES = [
+    'alt', 'alt_l', 'alt_r', 'alt_gr', 'backspace', 'caps_lock',
+    'cmd', 'cmd_l', 'cmd_r', 'ctrl', 'ctrl_l', 'ctrl_r', 'delete',
+    'down', 'end', 'enter', 'esc', 'f1', 'f2', 'f3', 'f4', 'f5', 'f6',
+    'f7', 'f8', 'f9', 'f10', 'f11', 'f12', 'f13', 'f14', 'f15', 'f16',
+    'f17', 'f18', 'f19', 'f20', 'home', 'insert', 'left',
+    'media_next', 'media_play_pause', 'media_previous',
+    'media_volume_down', 'media_volume_mute', 'media_volume_up',
+    'menu', 'num_lock', 'page_down', 'page_up', 'pause', 'print_screen',
+    'right', 'scroll_lock', 'shift', 'shift_l', 'shift_r', 'space',
+    'tab', 'up',
+]
+SPECIAL_KEY_BY_ID = {i + 1: name for i, name in enumerate(SPECIAL_KEY_NAMES)}
+SPECIAL_KEY_IDS = {name: i + 1 for i, name in enumerate(SPECIAL_KEY_NAMES)}
+
+class InputForwarder:
+    def __init__(self, control_port=5556, net_config=None, stream_size=None):
+        self.control_port = control_port
+        self.net_config = net_config or NetworkConfig()
+        self.running = False
+        self.socket = None
+        self.client_address = None
+        # The client scales its pointer to stream resolution before
+        # sending; incoming coordinates are mapped back to this
+        # desktop's resolution with the inverse int num/den pair
+        self.stream_size = stream_size
+        self._rx_num_x = self._rx_den_x = 1
+        self._rx_num_y = self._rx_den_y = 1
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self._recv_sockets = []
+        self._recv_threads = []
+
+        # Newest-wins mailbox for mouse moves: intermediate positions are
+        # superseded by the latest one, so fast motion collapses to at
+        # most ~120 packets/s instead of one per pynput callback
+        self._pending_move = None
+        # Discrete events (clicks, scrolls, keys) queue as plain tuples
+        # and the flusher packs them into fixed binary records - same
+        # 26-byte wire format the client sends us
+        self._pending_events = collections.deque()
+        self._flush_interval = 1.0 / 120.0
+        self._flush_thread = None
+        self._dropped_sends = 0
+
+        # Local pyautogui simulation runs on its own worker so OS syscalls
+        # never sit between a pynput callback and the network send
+        self._sim_queue = queue.Queue()
+        self._sim_thread = None
+
+    def connect(self, client_ip):
+        try:
+            self.client_address = (client_ip, self.control_port)
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            apply_socket_tuning(self.socket, self.net_config)
+            # Never let a full send buffer block the flusher; input
+            # events are droppable and the next flush supersedes them
+            self.socket.setblocking(False)
+
+            if INPUT_AVAILABLE and self.stream_size:
+                stream_w, stream_h = self.stream_size
+                if stream_w > 0 and stream_h > 0:
+                    screen_w, screen_h = pyautogui.size()
+                    self._rx_num_x, self._rx_den_x = screen_w, stream_w
+                    self._rx_num_y, self._rx_den_y = screen_h, stream_h
+
+            self.running = True
+            self._start_input_receivers()
+            if INPUT_AVAILABLE:
+                self._start_input_listeners()
+
+            return True
+        except Exception as e:
+            print(f"Input forwarder connection error: {e}")
+            return False
+
+    def _start_input_receivers(self):
+        """Bind the control port and apply the client's input locally.
+
+        With SO_REUSEPORT the kernel hashes senders across several bound
+        sockets, so each receive thread drains and dispatches its own
+        share without contending on one socket; platforms without it get
+        a single socket.
+        """
+        num_sockets = 1
+        if hasattr(socket, 'SO_REUSEPORT'):
+            num_sockets = max(1, (os.cpu_count() or 2) // 2)
+        try:
+            for _ in range(num_sockets):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                if num_sockets > 1:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                apply_socket_tuning(sock, self.net_config)
+                sock.settimeout(0.5)
+                sock.bind(("", self.control_port))
+                self._recv_sockets.append(sock)
+                thread = threading.Thread(target=self._input_receive_loop,
+                                          args=(sock,), daemon=True)
+                thread.start()
+                self._recv_threads.append(thread)
+            print(f"Input receiver listening on {num_sockets} socket(s)")
+        except Exception as e:
+            print(f"Input receiver setup error: {e}")
+
+    def _input_receive_loop(self, sock):
+        rec_size = INPUT_EVENT_STRUCT.size
+        unpack_from = INPUT_EVENT_STRUCT.unpack_from
+        while self.running:
+            try:
+                data, _ = sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            # Datagrams carry whole batches of fixed-size records
+            for offset in range(0, len(data) - rec_size + 1, rec_size):
+                try:
+                    self._apply_wire_event(unpack_from(data, offset))
+                except Exception as e:
+                    print(f"Input apply error: {e}")
+
+    def _apply_wire_event(self, record):
+        if not INPUT_AVAILABLE:
+            return
+        event_type, action, f1, f2, f3, f4, _ts = record
+        if event_type == EVENT_MOUSE:
+            # Stream-resolution coordinates back to desktop resolution
+            x = (f1 * self._rx_num_x) // self._rx_den_x
+            y = (f2 * self._rx_num_y) // self._rx_den_y
+            if action == MOUSE_MOVE:
+                pyautogui.moveTo(x, y)
+            elif action == MOUSE_PRESS or action == MOUSE_RELEASE:
+                # id 0 means the client couldn't map the button (side
+                # buttons and the like) - drop it rather than turn it
+                # into a phantom left click
+                button = BUTTON_NAME_BY_ID.get(f3)
+                if button is None:
+                    return
+                if action == MOUSE_PRESS:
+                    pyautogui.mouseDown(x, y, button=button)
+                else:
+                    pyautogui.mouseUp(x, y, button=button)
+            elif action == MOUSE_SCROLL:
+                pyautogui.scroll(f4)
+        elif event_type == EVENT_KEYBOARD:
+            key = chr(f1) if f2 == 0 else SPECIAL_KEY_BY_ID.get(f1)
+            if not key:
+                return
+            if action == KEY_PRESS:
+                pyautogui.keyDown(key)
+            else:
+                pyautogui.keyUp(key)
+    
+    def _start_input_listeners(self):
+        self.running = True
+        
+        self.mouse_listener = mouse.Listener(
+            on_move=self._on_mouse_move,
+            on_click=self._on_mouse_click,
+            on_scroll=self._on_mouse_scroll
+        )
+        
+        self.keyboard_listener = keyboard.Listener(
+            on_press=self._on_key_press,
+            on_release=self._on_key_release
+        )
+        
+        self.mouse_listener.start()
+        self.keyboard_listener.start()
+
+        self._flush_thread = threading.Thread(target=self._flush_loop,
+                                              daemon=True)
+        self._flush_thread.start()
+
+        self._sim_thread = threading.Thread(target=self._simulation_loop,
+                                            daemon=True)
+        self._sim_thread.start()
+
+    def _simulate(self, func, *args, **kwargs):
+        self._sim_queue.put((func, args, kwargs))
+
+    def _simulation_loop(self):
+        while self.running:
+            try:
+                func, args, kwargs = self._sim_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"Input simulation error: {e}")
+
+    def _flush_loop(self):
+        # Fixed-size records make framing trivial; keep each datagram
+        # under a conservative 1400-byte MTU budget
+        per_datagram = 1400 // INPUT_EVENT_STRUCT.size
+        while self.running:
+            time.sleep(self._flush_interval)
+            # One bad record must not kill the flusher for good - the
+            # client's flush loop guards itself the same way
+            try:
+                events = []
+                while self._pending_events:
+                    try:
+                        events.append(self._pending_events.popleft())
+                    except IndexError:
+                        break
+                move = self._pending_move
+                if move is not None:
+                    self._pending_move = None
+                    events.append((EVENT_MOUSE, MOUSE_MOVE, move[0], move[1], 0, 0))
+                if not events:
+                    continue
+
+                ts = _now_ns()
+                pack = INPUT_EVENT_STRUCT.pack
+                records = [pack(*evt, ts) for evt in events]
+                for i in range(0, len(records), per_datagram):
+                    self._send_datagram(b''.join(records[i:i + per_datagram]))
+            except Exception as e:
+                print(f"Input flush error: {e}")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _key_to_wire(key_str):
+        """Map a key string to (code, is_special) for the wire format"""
+        if len(key_str) == 1:
+            return ord(key_str), 0
+        return SPECIAL_KEY_IDS.get(key_str, 0), 1
+
+    def _send_datagram(self, data):
+        if self.socket and self.client_address:
+            try:
+                self.socket.sendto(data, self.client_address)
+            except BlockingIOError:
+                self._dropped_sends += 1
+            except Exception as e:
+                print(f"Input send error: {e}")
+    
+    def _on_mouse_move(self, x, y):
+        # pynput reports floats on macOS; the wire format is int32
+        self._pending_move = (int(x), int(y))
+
+    def _on_mouse_click(self, x, y, button, pressed):
+        button_name = BUTTON_NAME_BY_ENUM.get(button) or str(button).rsplit('.', 1)[-1]
+
+        self._pending_events.append((
+            EVENT_MOUSE, MOUSE_PRESS if pressed else MOUSE_RELEASE,
+            int(x), int(y), BUTTON_ID_BY_NAME.get(button_name, 0), 0))
+
+        if INPUT_AVAILABLE:
+            if pressed:
+                self._simulate(pyautogui.mouseDown, x, y, button=button_name)
+            else:
+                self._simulate(pyautogui.mouseUp, x, y, button=button_name)
+    
+    def _on_mouse_scroll(self, x, y, dx, dy):
+        self._pending_events.append(
+            (EVENT_MOUSE, MOUSE_SCROLL, int(x), int(y), int(dx), int(dy)))
+
+        if INPUT_AVAILABLE:
+            self._simulate(pyautogui.scroll, dy)
+    
+    def _on_key_press(self, key):
+        try:
+            key_str = self._key_to_string(key)
+            code, special = self._key_to_wire(key_str)
+            self._pending_events.append((EVENT_KEYBOARD, KEY_PRESS, code, special, 0, 0))
+
+            if INPUT_AVAILABLE:
+                self._simulate(pyautogui.keyDown, key_str)
+
+        except Exception as e:
+            print(f"Key press error: {e}")
+    
+    def _on_key_release(self, key):
+        try:
+            key_str = self._key_to_string(key)
+            code, special = self._key_to_wire(key_str)
+            self._pending_events.append((EVENT_KEYBOARD, KEY_RELEASE, code, special, 0, 0))
+
+            if INPUT_AVAILABLE:
+                self._simulate(pyautogui.keyUp, key_str)
+
+        except Exception as e:
+            print(f"Key release error: {e}")
+    
+    def _key_to_string(self, key):
+        if hasattr(key, 'char') and key.char is not None:
+            return key.char
+        return KEY_NAME_BY_ENUM.get(key) or str(key).rsplit('.', 1)[-1]
+    
+    def disconnect(self):
+        self.running = False
+        
+        if self.mouse_listener:
+            self.mouse_listener.stop()
+        if self.keyboard_listener:
+            self.keyboard_listener.stop()
+        for sock in self._recv_sockets:
+            sock.close()
+        self._recv_sockets = []
+        self._recv_threads = []
+        if self.socket:
+            self.socket.close()
+
+# ========== PERFORMANCE ==========
+# Multiply by a precomputed reciprocal instead of re-deriving 1024**n
+# and dividing on every sample
+_INV_GB = 1.0 / (1024 ** 3)
+_INV_MB = 1.0 / (1024 ** 2)
+
+class _LinuxProcSampler:
+    """Reads CPU and memory figures straight from procfs.
+
+    psutil reopens and fully parses /proc/stat and /proc/meminfo on
+    every call. The monitor only needs a handful of fields, so keeping
+    the fds open and pread-ing into a scan for just those lines is
+    several times cheaper per sample. Linux only; the monitor falls
+    back to psutil elsewhere or if procfs misbehaves.
+    """
+
+    def __init__(self):
+        self._stat_fd = os.open('/proc/stat', os.O_RDONLY)
+        self._mem_fd = os.open('/proc/meminfo', os.O_RDONLY)
+        self._self_fd = os.open('/proc/self/stat', os.O_RDONLY)
+        self._hz = os.sysconf('SC_CLK_TCK')
+        self._page = os.sysconf('SC_PAGE_SIZE')
+        self._prev_cpu = None
+        self._prev_proc = None
+
+    def cpu_percent(self):
+        buf = os.pread(self._stat_fd, 4096, 0)
+        vals = [int(v) for v in buf[:buf.find(b'\n')].split()[1:]]
+        idle = vals[3] + vals[4]  # idle + iowait
+        total = sum(vals)
+        prev = self._prev_cpu
+        self._prev_cpu = (idle, total)
+        if prev is None or total <= prev[1]:
+            return 0.0
+        dt = total - prev[1]
+        return 100.0 * (1.0 - (idle - prev[0]) / dt)
+
+    def memory(self):
+        """Returns (percent, used_bytes, total_bytes)"""
+        buf = os.pread(self._mem_fd, 8192, 0)
+        total = self._field(buf, b'MemTotal:')
+        avail = self._field(buf, b'MemAvailable:')
+        used = total - avail
+        percent = 100.0 * used / total if total else 0.0
+        return percent, used * 1024, total * 1024
+
+    def process_stats(self):
+        """Returns (cpu_percent, rss_bytes, num_threads) for this
+        process from a single /proc/self/stat read.
+
+        One pread and one split replace psutil's cpu_percent +
+        memory_info + num_threads round trips. Fields are counted from
+        after the ')' closing the comm field, since comm may contain
+        spaces.
+        """
+        buf = os.pread(self._self_fd, 1024, 0)
+        parts = buf[buf.rfind(b')') + 2:].split()
+        busy = (int(parts[11]) + int(parts[12])) / self._hz  # utime+stime
+        threads = int(parts[17])
+        rss = int(parts[21]) * self._page
+        now = time.monotonic()
+        prev = self._prev_proc
+        self._prev_proc = (busy, now)
+        if prev is None or now <= prev[1]:
+            return 0.0, rss, threads
+        cpu = 100.0 * (busy - prev[0]) / (now - prev[1])
+        return cpu, rss, threads
+
+    @staticmethod
+    def _field(buf, name):
+        """Value in kB of a 'Name:   12345 kB' meminfo line"""
+        i = buf.find(name)
+        if i < 0:
+            return 0
+        return int(buf[i + len(name):buf.find(b'kB', i)])
+
+    def close(self):
+        os.close(self._stat_fd)
+        os.close(self._mem_fd)
+        os.close(self._self_fd)
+
+class PerformanceMonitor:
+    """Samples system and process health once a second for the GUI.
+
+    Per-process psutil calls run inside a single oneshot() context so
+    the underlying /proc (or perf-counter) read is done once per sample
+    and shared across memory_info/cpu_percent/num_threads, instead of
+    once per method.
+    """
+
+    def __init__(self):
+        self.running = False
+        # Event instead of sleep(1.0): stop_monitoring can interrupt the
+        # wait immediately rather than eating up to a second of shutdown
+        self._stop = threading.Event()
+        self._interval = 1.0
+        self.thread = None
+        # Double-buffered samples: the writer fills whichever dict is
+        # not currently published, then swaps the reference. Steady
+        # state allocates nothing per sample, and a reader holding the
+        # old snapshot never sees it mutated mid-read.
+        self._buf_a = self._make_stats_buf()
+        self._buf_b = self._make_stats_buf()
+        # What readers get is a read-only view of the published buffer:
+        # a caller that tries to mutate the snapshot fails loudly
+        # instead of silently corrupting the writer's state. The
+        # proxies are allocated once here, like the buffers they wrap.
+        self._proxy_a = types.MappingProxyType(self._buf_a)
+        self._proxy_b = types.MappingProxyType(self._buf_b)
+        self.stats = {}
+        # Constructing a Process stats the pid; do it once here rather
+        # than every loop iteration
+        self._proc = psutil.Process() if PSUTIL_AVAILABLE else None
+        self._include_disk = False
+        self._include_net = False
+        # Previous counter readings so rates can be published directly;
+        # consumers shouldn't each have to diff cumulative totals
+        self._prev_disk = None
+        self._prev_net = None
+        self._prev_ts = None
+        # Errors are recorded, not printed: a stdout write from the
+        # sampling thread holds the GIL through console I/O and skews
+        # the very numbers being measured. Bounded so a recurring fault
+        # can't grow without limit.
+        self.errors = collections.deque(maxlen=32)
+        self._fast = None
+        if _PLATFORM == 'linux':
+            try:
+                self._fast = _LinuxProcSampler()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _make_stats_buf():
+        return {
+            'timestamp': 0.0,
+            'monotonic': 0.0,
+            'platform': _PLATFORM,
+            'system': {
+                'cpu_percent': 0.0,
+                'memory_percent': 0.0,
+                'memory_used_gb': 0.0,
+                'memory_total_gb': 0.0,
+                'disk_read_mb': 0,
+                'disk_write_mb': 0,
+                'net_sent_mb': 0,
+                'net_recv_mb': 0,
+                'disk_read_mbps': 0.0,
+                'disk_write_mbps': 0.0,
+                'net_sent_mbps': 0.0,
+                'net_recv_mbps': 0.0,
+            },
+            'process': {
+                'memory_mb': 0.0,
+                'cpu_percent': 0.0,
+                'threads': 0,
+            },
+        }
+
+    def start_monitoring(self, include_disk=False, include_net=False):
+        """Start sampling. Disk and net counters are the most expensive
+        psutil calls in the loop and the GUI doesn't display them, so
+        they're opt-in; their stats read 0 when disabled."""
+        if not PSUTIL_AVAILABLE:
+            print("psutil not available - performance monitoring disabled")
+            return False
+        # Probe the counters once: they return None only when the
+        # platform has them disabled, which is a startup property, not
+        # a per-sample one - so the loop never needs to re-check
+        self._include_disk = include_disk and psutil.disk_io_counters() is not None
+        self._include_net = include_net and psutil.net_io_counters() is not None
+        self.running = True
+        self._stop.clear()
+        # Prime psutil's internal CPU counters so the first interval=None
+        # reading in the loop has a baseline to diff against (the very
+        # first call otherwise returns a meaningless 0.0)
+        psutil.cpu_percent(interval=None)
+        self.thread = threading.Thread(target=self._monitoring_loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def _monitoring_loop(self):
+        # Deprioritize the sampler so it doesn't compete with capture/
+        # encode and skew its own measurements. On Linux setpriority
+        # applies to the calling thread only; there's no per-thread
+        # equivalent worth using on Windows (priority classes are
+        # process-wide), so this is best-effort POSIX.
+        try:
+            os.nice(5)
+        except (AttributeError, OSError):
+            pass
+        while self.running:
+            ok = self.sample_once()
+            # Back off harder while sampling is failing
+            if self._stop.wait(self._interval if ok else 5.0):
+                break
+
+    def sample_once(self):
+        """Take one sample and publish it; returns False on failure.
+
+        Split out from the loop so a scheduler that already ticks at
+        the right rate (the Tk after loop) can drive sampling without
+        this class owning a thread.
+        """
+        # The procfs path covers everything the GUI shows, so Linux can
+        # sample even without psutil installed
+        if self._proc is None and self._fast is None:
+            return False
+        try:
+            if self._fast is not None:
+                cpu_percent = self._fast.cpu_percent()
+                mem_percent, mem_used, mem_total = self._fast.memory()
+            else:
+                # interval=None returns the usage since the last call
+                # instead of sleeping inside the sample; the caller's
+                # schedule sets the sampling interval
+                cpu_percent = psutil.cpu_percent(interval=None)
+                memory = psutil.virtual_memory()
+                mem_percent = memory.percent
+                mem_used = memory.used
+                mem_total = memory.total
+            disk_io = psutil.disk_io_counters() if self._include_disk else None
+            net_io = psutil.net_io_counters() if self._include_net else None
+
+            if self._fast is not None:
+                proc_cpu, proc_rss, proc_threads = self._fast.process_stats()
+            else:
+                with self._proc.oneshot():
+                    proc_rss = self._proc.memory_info().rss
+                    proc_cpu = self._proc.cpu_percent()
+                    proc_threads = self._proc.num_threads()
+
+            # Deltas diff the monotonic clock: an NTP step or DST jump
+            # in wall time would otherwise produce negative dt and
+            # garbage rates. Wall time is still published for display.
+            now = time.monotonic()
+            dt = now - self._prev_ts if self._prev_ts else 1.0
+            disk_read_mbps = disk_write_mbps = 0.0
+            if disk_io is not None and self._prev_disk is not None:
+                disk_read_mbps = (disk_io.read_bytes - self._prev_disk.read_bytes) * _INV_MB / dt
+                disk_write_mbps = (disk_io.write_bytes - self._prev_disk.write_bytes) * _INV_MB / dt
+            net_sent_mbps = net_recv_mbps = 0.0
+            if net_io is not None and self._prev_net is not None:
+                net_sent_mbps = (net_io.bytes_sent - self._prev_net.bytes_sent) * _INV_MB / dt
+                net_recv_mbps = (net_io.bytes_recv - self._prev_net.bytes_recv) * _INV_MB / dt
+            self._prev_disk = disk_io
+            self._prev_net = net_io
+            self._prev_ts = now
+
+            # Fill the buffer that isn't published, then swap: the
+            # attribute store is atomic under the GIL, so readers see
+            # either the previous complete sample or this one, and no
+            # dicts are allocated per sample
+            if self.stats is self._proxy_a:
+                buf, proxy = self._buf_b, self._proxy_b
+            else:
+                buf, proxy = self._buf_a, self._proxy_a
+            buf['timestamp'] = time.time()
+            buf['monotonic'] = now
+            system = buf['system']
+            system['cpu_percent'] = cpu_percent
+            system['memory_percent'] = mem_percent
+            system['memory_used_gb'] = mem_used * _INV_GB
+            system['memory_total_gb'] = mem_total * _INV_GB
+            # disk_io/net_io are guaranteed non-None whenever their
+            # flag is set (probed at start_monitoring); disabled fields
+            # keep their initial 0
+            if disk_io is not None:
+                system['disk_read_mb'] = disk_io.read_bytes * _INV_MB
+                system['disk_write_mb'] = disk_io.write_bytes * _INV_MB
+            if net_io is not None:
+                system['net_sent_mb'] = net_io.bytes_sent * _INV_MB
+                system['net_recv_mb'] = net_io.bytes_recv * _INV_MB
+            system['disk_read_mbps'] = disk_read_mbps
+            system['disk_write_mbps'] = disk_write_mbps
+            system['net_sent_mbps'] = net_sent_mbps
+            system['net_recv_mbps'] = net_recv_mbps
+            process = buf['process']
+            process['memory_mb'] = proc_rss * _INV_MB
+            process['cpu_percent'] = proc_cpu
+            process['threads'] = proc_threads
+            self.stats = proxy
+            return True
+
+        except Exception as e:
+            self.errors.append((time.time(), repr(e)))
+            return False
+
+    def get_stats(self):
+        """Latest complete sample as a read-only mapping; lock-free,
+        no copy, may be one sampling interval stale"""
+        return self.stats
+
+    def get_errors(self):
+        """Recent sampling errors as (timestamp, repr) pairs"""
+        return list(self.errors)
+
+    def set_interval(self, seconds):
+        """Sampling period for the threaded mode; picked up on the
+        next iteration"""
+        self._interval = seconds
+
+    def stop_monitoring(self):
+        self.running = False
+        self._stop.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        if self._fast is not None:
+            self._fast.close()
+            self._fast = None
+
+# ========== MAIN HOST GUI ==========
+class EdgeLiteHost:
+    def __init__(self):
+        self.config_manager = ConfigManager()
+        self.capture = None
+        self.encoder = None
+        self.streamer = None
+        self.input_forwarder = None
+        
+        self.streaming = False
+        self.client_ip = None
+        self._local_ip = None
+        self._quitting = False
+        self._log_buf = collections.deque()
+        self._log_flush_scheduled = False
+
+        net = self.config_manager.network_config
+        self.discovery = NetworkDiscovery(net.discovery_port, net.video_port,
+                                          net.control_port, net_config=net)
+        self.discovery.start_discovery()
+
+        # Sampling is driven by the GUI's 1s after-tick rather than a
+        # dedicated thread - see update_performance
+        self.performance_monitor = PerformanceMonitor()
+
+        self.setup_gui()
+    
+    def setup_gui(self):
+        self.root = tk.Tk()
+        self.root.title("EdgeLite Host")
+        self.root.geometry("500x400")
+        
+        # Main container
+        main_frame = ttk.Frame(self.root, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title
+        title_label = ttk.Label(main_frame, text="🎮 EdgeLite Streaming Host", font=('Arial', 16, 'bold'))
+        title_label.pack(pady=(0, 20))
+        
+        # Connection section
+        conn_frame = ttk.LabelFrame(main_frame, text="Client Connection", padding="10")
+        conn_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(conn_frame, text="Client IP:").pack(side=tk.LEFT)
+        self.client_ip_var = tk.StringVar()
+        ip_entry = ttk.Entry(conn_frame, textvariable=self.client_ip_var, width=20)
+        ip_entry.pack(side=tk.LEFT, padx=(5, 10))
+        
+        self.connect_btn = ttk.Button(conn_frame, text="Start Streaming", command=self.toggle_streaming)
+        self.connect_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        # Connection status
+        self.connection_status = ttk.Label(conn_frame, text="Disconnected", foreground="red")
+        self.connection_status.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Settings
+        settings_frame = ttk.LabelFrame(main_frame, text="Stream Settings", padding="10")
+        settings_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Resolution
+        res_frame = ttk.Frame(settings_frame)
+        res_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(res_frame, text="Resolution:").pack(side=tk.LEFT)
+        self.resolution = tk.StringVar(value=f"{self.config_manager.stream_config.width}x{self.config_manager.stream_config.height}")
+        res_combo = ttk.Combobox(res_frame, textvariable=self.resolution, values=["1280x720", "1920x1080"], width=15)
+        res_combo.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Frame rate
+        fps_frame = ttk.Frame(settings_frame)
+        fps_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(fps_frame, text="Frame Rate:").pack(side=tk.LEFT)
+        self.fps = tk.StringVar(value=str(self.config_manager.stream_config.fps))
+        fps_combo = ttk.Combobox(fps_frame, textvariable=self.fps, values=["30", "60"], width=15)
+        fps_combo.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Bitrate
+        bitrate_frame = ttk.Frame(settings_frame)
+        bitrate_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(bitrate_frame, text="Bitrate:").pack(side=tk.LEFT)
+        self.bitrate = tk.StringVar(value=self.config_manager.stream_config.bitrate)
+        bitrate_combo = ttk.Combobox(bitrate_frame, textvariable=self.bitrate, values=["1M", "2M", "5M"], width=15)
+        bitrate_combo.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Status
+        status_frame = ttk.LabelFrame(main_frame, text="Status", padding="10")
+        status_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        self.status_text = tk.Text(status_frame, height=10)
+        self.status_text.pack(fill=tk.BOTH, expand=True)
+
+        self.perf_label = ttk.Label(status_frame, text="Performance: --")
+        self.perf_label.pack(anchor=tk.W, pady=(5, 0))
+        # Nobody reads the numbers while the window is unfocused or
+        # minimized, so sampling drops to every 10s until it comes back
+        self._perf_interval_ms = 1000
+        self.root.bind('<FocusIn>', lambda e: self._set_perf_interval(e, 1000))
+        self.root.bind('<FocusOut>', lambda e: self._set_perf_interval(e, 10000))
+        self.root.after(1000, self.update_performance)
+
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+        
+        ttk.Button(button_frame, text="Apply Settings", command=self.apply_settings).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Clear Log", command=self.clear_log).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Quit", command=self.quit_app).pack(side=tk.LEFT)
+        
+        self.log("Host started. Ready to stream.")
+        self.log(f"Your IP: {self.get_local_ip()}")
+        self.log("Enter client IP and click 'Start Streaming'")
+    
+    def get_local_ip(self):
+        # Cached after the first probe: the answer only changes when the
+        # machine switches networks, and the UDP connect is a syscall
+        # round-trip we don't need on every streaming restart
+        if self._local_ip is not None:
+            return self._local_ip
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))
+            ip = s.getsockname()[0]
+            s.close()
+        except:
+            return "127.0.0.1"
+        self._local_ip = ip
+        return ip
+    
+    def toggle_streaming(self):
+        if not self.streaming:
+            self.start_streaming()
+        else:
+            self.stop_streaming()
+    
+    def start_streaming(self):
+        client_ip = self.client_ip_var.get().strip()
+        if not client_ip:
+            messagebox.showerror("Error", "Please enter client IP address")
+            return
+        
+        try:
+            width, height = map(int, self.resolution.get().split('x'))
+            fps = int(self.fps.get())
+            bitrate = self.bitrate.get()
+            
+            frame_format = self.config_manager.stream_config.frame_format
+            capture_format = "yuv420" if frame_format == "yuv420p" else "bgra"
+            self.capture = HighPerformanceCapture(fps, pixel_format=capture_format)
+            self.encoder = HardwareEncoder(width, height, fps, bitrate)
+            net = self.config_manager.network_config
+            self.streamer = Streamer(net.video_port, net.control_port, net_config=net)
+            self.input_forwarder = InputForwarder(net.control_port, net_config=net,
+                                                  stream_size=(width, height))
+            
+            self.encoder.start_encoding()
+            
+            if not self.streamer.start_streaming(client_ip):
+                raise Exception("Failed to start streaming")
+            
+            if not self.input_forwarder.connect(client_ip):
+                self.log("Warning: Input forwarding not available")
+            
+            self.capture.start_capture(on_frame_callback=self.encoder.add_frame)
+            
+            self.streaming = True
+            self.stream_thread = threading.Thread(target=self._stream_packets, daemon=True)
+            self.stream_thread.start()
+            
+            self.client_ip = client_ip
+            self.connect_btn.config(text="Stop Streaming")
+            self.connection_status.config(text="Connected", foreground="green")
+            
+            self.log(f"Started streaming to {client_ip}")
+            self.log(f"Resolution: {width}x{height} {fps}fps")
+            self.log(f"Encoder: {self.encoder.encoder_name}")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to start streaming: {e}")
+            self.log(f"Stream start error: {e}")
+            self.cleanup_components()
+    
+    def _stream_packets(self):
+        while self.streaming:
+            try:
+                # One blocking wake per burst: after the condvar fires,
+                # drain everything already queued before sleeping again
+                packet = self.encoder.get_packet(timeout=0.1)
+                while packet is not None:
+                    self.streamer.send_packet(packet)
+                    packet = self.encoder.get_packet()
+            except Exception as e:
+                self.log(f"Packet streaming error: {e}")
+                time.sleep(0.001)
+    
+    def stop_streaming(self):
+        self.streaming = False
+        self.cleanup_components()
+        
+        self.connect_btn.config(text="Start Streaming")
+        self.connection_status.config(text="Disconnected", foreground="red")
+        self.log("Streaming stopped")
+    
+    def cleanup_components(self):
+        if self.capture:
+            self.capture.stop_capture()
+            self.capture = None
+        
+        if self.encoder:
+            self.encoder.stop_encoding()
+            self.encoder = None
+        
+        if self.streamer:
+            self.streamer.stop_streaming()
+            self.streamer = None
+        
+        if self.input_forwarder:
+            self.input_forwarder.disconnect()
+            self.input_forwarder = None
+    
+    def apply_settings(self):
+        try:
+            width, height = map(int, self.resolution.get().split('x'))
+            self.config_manager.stream_config.width = width
+            self.config_manager.stream_config.height = height
+            self.config_manager.stream_config.fps = int(self.fps.get())
+            self.config_manager.stream_config.bitrate = self.bitrate.get()
+            
+            self.log("Settings applied")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Invalid settings: {e}")
+    
+    def log(self, message):
+        # Each Text insert triggers a redraw pass, so bursts of log
+        # lines are buffered and flushed together at ~30Hz
+        self._log_buf.append(f"{time.strftime('%H:%M:%S')} - {message}")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after(33, self._flush_log)
+
+    def _flush_log(self):
+        self._log_flush_scheduled = False
+        if not self._log_buf:
+            return
+        self.status_text.insert(tk.END, '\n'.join(self._log_buf) + '\n')
+        self._log_buf.clear()
+        self.status_text.see(tk.END)
+    
+    def clear_log(self):
+        self.status_text.delete(1.0, tk.END)
+    
+    def _set_perf_interval(self, event, ms):
+        # Focus events from child widgets bubble to the toplevel too;
+        # only react to the window itself gaining/losing focus
+        if event.widget is self.root:
+            self._perf_interval_ms = ms
+
+    def update_performance(self):
+        # A sample takes a few ms through oneshot/procfs, so it runs
+        # directly on the Tk tick: one fewer OS thread, and the reader
+        # and writer of the stats dict are the same thread
+        self.performance_monitor.sample_once()
+        stats = self.performance_monitor.get_stats()
+        if stats:
+            system = stats['system']
+            process = stats['process']
+            self.perf_label.config(
+                text=f"Performance: CPU {system['cpu_percent']:.0f}% | "
+                     f"RAM {system['memory_percent']:.0f}% | "
+                     f"Host {process['memory_mb']:.0f}MB / {process['cpu_percent']:.0f}%")
+        self.root.after(self._perf_interval_ms, self.update_performance)
+
+    def quit_app(self):
+        # Reached from the Quit button, Ctrl-C and run()'s finally; the
+        # guard keeps the teardown (thread joins, socket closes) from
+        # running twice
+        if self._quitting:
+            return
+        self._quitting = True
+        self.streaming = False
+        # Each teardown is dominated by joins and socket timeouts; run
+        # them in parallel so exit waits for the slowest one, not the
+        # sum of all three
+        tasks = [self.cleanup_components]
+        if self.discovery:
+            tasks.append(self.discovery.stop_discovery)
+        if self.performance_monitor:
+            tasks.append(self.performance_monitor.stop_monitoring)
+        executor = ThreadPoolExecutor(max_workers=len(tasks))
+        wait([executor.submit(task) for task in tasks], timeout=3.0)
+        executor.shutdown(wait=False)
+        self.root.quit()
+    
+    def run(self):
+        try:
+            self.root.mainloop()
+        finally:
+            # Single teardown path - covers normal exit, Ctrl-C and the
+            # window manager closing us; quit_app itself is idempotent
+            self.quit_app()
+
+if __name__ == "__main__":
+    print("Starting EdgeLite Host...")
+    app = EdgeLiteHost()
+    app.run()